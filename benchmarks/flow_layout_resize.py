@@ -0,0 +1,127 @@
+"""
+Times how long a FlowLayout takes to respond to each step of an interactive
+resize, compared to the previous implementation which re-flowed every item
+(re-reading its size hint several times) on every call.
+
+Each step queries heightForWidth a few times before setting the geometry,
+as Qt does when resizing a widget with a height for width layout. The
+layouts hold real QPushButtons.
+
+Run with any Qt binding available, for example:
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/flow_layout_resize.py
+"""
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qute.vendor import Qt
+from qute.extensions import flow_layout
+
+
+# -- PySide6 6.12 with Python 3.11 drops a reference to None every time
+# -- QLayoutItem.setGeometry is called from Python, and the interpreter
+# -- aborts once None has no references left (none_dealloc). This holds
+# -- enough references to None to cover every item being positioned on
+# -- every step, so real widgets can be measured at every item count. It
+# -- makes no difference to the timings or to other bindings
+_NONE_REFERENCES = list()
+
+
+# ------------------------------------------------------------------------------
+class UncachedFlowLayout(flow_layout.FlowLayout):
+    """
+    The layout as it was before size hints and flows were cached
+    """
+
+    def heightForWidth(self, width):
+        return self.doLayout(Qt.QtCore.QRect(0, 0, width, 0), True)
+
+    def doLayout(self, rect, testOnly):
+        x = rect.x()
+        y = rect.y()
+        lineHeight = 0
+
+        for item in self.itemList:
+            spaceX = self.spacing()
+            spaceY = self.spacing()
+            nextX = x + item.sizeHint().width() + spaceX
+            if nextX - spaceX > rect.right() and lineHeight > 0:
+                x = rect.x()
+                y = y + lineHeight + spaceY
+                nextX = x + item.sizeHint().width() + spaceX
+                lineHeight = 0
+
+            if not testOnly:
+                item.setGeometry(Qt.QtCore.QRect(Qt.QtCore.QPoint(x, y), item.sizeHint()))
+
+            x = nextX
+            lineHeight = max(lineHeight, item.sizeHint().height())
+
+        return y + lineHeight - rect.y()
+
+
+# ------------------------------------------------------------------------------
+def resize(layout_class, labels, steps=50):
+    """
+    Returns the mean number of milliseconds each step of the resize took
+    """
+    _NONE_REFERENCES.extend([None] * (len(labels) * (steps + 1) * 2))
+
+    container = Qt.QtWidgets.QWidget()
+    layout = layout_class(container)
+
+    for label in labels:
+        button = Qt.QtWidgets.QPushButton(label)
+        layout.addWidget(button)
+
+    widths = [400 + step * 8 for step in range(steps)]
+
+    started = time.time()
+
+    for width in widths:
+        for _ in range(3):
+            layout.heightForWidth(width)
+
+        layout.setGeometry(
+            Qt.QtCore.QRect(0, 0, width, layout.heightForWidth(width)),
+        )
+
+    elapsed = time.time() - started
+
+    container.deleteLater()
+
+    return elapsed / len(widths) * 1000
+
+
+# ------------------------------------------------------------------------------
+def main():
+    q_app = Qt.QtWidgets.QApplication.instance() or Qt.QtWidgets.QApplication(sys.argv)
+
+    random.seed(0)
+
+    for count in (100, 1000, 10000):
+        labels = [
+            'Item %s' % ('x' * random.randint(1, 12))
+            for _ in range(count)
+        ]
+
+        uncached = resize(UncachedFlowLayout, labels)
+        cached = resize(flow_layout.FlowLayout, labels)
+
+        print(
+            '%6d items : uncached %8.2fms per step, cached %8.2fms per step' % (
+                count,
+                uncached,
+                cached,
+            )
+        )
+
+        q_app.processEvents()
+
+
+if __name__ == '__main__':
+    main()
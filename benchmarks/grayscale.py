@@ -0,0 +1,125 @@
+"""
+Times converting images from icon sizes up to 4K to grayscale with each of
+the methods toGrayscale can use, compared to processing every pixel
+individually, which is how images were previously converted.
+
+Every method is checked to give the same pixels as processing every pixel
+individually before it is timed. Processing every pixel individually takes
+tens of seconds at 4K, so it is only timed up to 1024x1024.
+
+Run with any Qt binding available (and optionally numpy), for example:
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/grayscale.py
+"""
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qute.vendor import Qt
+from qute.utilities import pixmaps
+
+
+SIZES = [
+    (16, 16),
+    (64, 64),
+    (256, 256),
+    (1024, 1024),
+    (3840, 2160),
+]
+
+# -- The largest number of pixels to process individually
+PER_PIXEL_LIMIT = 1024 * 1024
+
+
+# ------------------------------------------------------------------------------
+def image(width, height):
+    """
+    Returns a semi-transparent premultiplied image of the given size, as
+    QPixmap.toImage gives for icons with an alpha channel
+    """
+    tile = Qt.QtGui.QImage(64, 64, Qt.QtGui.QImage.Format_ARGB32)
+
+    for x in range(tile.width()):
+        for y in range(tile.height()):
+            tile.setPixel(x, y, random.getrandbits(32))
+
+    result = Qt.QtGui.QImage(width, height, Qt.QtGui.QImage.Format_ARGB32)
+    result.fill(0)
+
+    painter = Qt.QtGui.QPainter(result)
+    painter.setCompositionMode(Qt.QtGui.QPainter.CompositionMode_Source)
+    painter.drawTiledPixmap(0, 0, width, height, Qt.QtGui.QPixmap.fromImage(tile))
+    painter.end()
+
+    return result.convertToFormat(Qt.QtGui.QImage.Format_ARGB32_Premultiplied)
+
+
+# ------------------------------------------------------------------------------
+def methods():
+    """
+    Returns the label and function of every method available here
+    """
+    available = list()
+
+    if pixmaps.numpy is not None:
+        available.append(('numpy', pixmaps._toGrayscaleImageNumpy))
+
+    if pixmaps._grayscale8MatchesQGray():
+        available.append(('grayscale8', pixmaps._toGrayscaleImageGrayscale8))
+
+    available.append(('bytes', pixmaps._toGrayscaleImageBytes))
+
+    return available
+
+
+# ------------------------------------------------------------------------------
+def timed(func, source, iterations):
+    """
+    Returns the result of the given method along with the mean number of
+    milliseconds a call of it took
+    """
+    started = time.time()
+
+    for _ in range(iterations):
+        result = func(source)
+        result.setAlphaChannel(pixmaps._alphaChannel(source))
+
+    return result, (time.time() - started) / iterations * 1000
+
+
+# ------------------------------------------------------------------------------
+def main():
+    q_app = Qt.QtWidgets.QApplication.instance() or Qt.QtWidgets.QApplication(sys.argv)
+
+    random.seed(0)
+
+    for width, height in SIZES:
+        source = image(width, height)
+        iterations = max(1, 65536 // (width * height))
+
+        timings = list()
+
+        if width * height <= PER_PIXEL_LIMIT:
+            expected, elapsed = timed(pixmaps._toGrayscaleImagePerPixel, source, 1)
+            timings.append('per pixel %10.2fms' % elapsed)
+
+        else:
+            expected = None
+            timings.append('per pixel %12s' % 'skipped')
+
+        for label, func in methods():
+            result, elapsed = timed(func, source, iterations)
+
+            # -- Ensure the method gives the same result before reporting it
+            assert expected is None or result == expected
+
+            timings.append('%s %10.2fms' % (label, elapsed))
+
+        print('%4dx%-4d : %s' % (width, height, ', '.join(timings)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Times how long a fresh interpreter takes to import qute, compared to an
+interpreter which does nothing, along with the cost of then using a Qt
+class through qute and of a star import (both of which import Qt).
+
+The vendored Qt.py is also timed on its own, with and without its opt-in
+QT_BINDING_CACHE and QT_LAZY_IMPORT start up options. The binding cache
+only saves the cost of failing to import bindings ahead of the resolved
+one and submodules the binding lacks, so it makes little difference where
+the first binding tried is complete.
+
+Each case is run in a new interpreter several times, with the fastest run
+being reported. Run with any Qt binding available, for example:
+
+    python benchmarks/import_time.py
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import subprocess
+
+
+# -- The root of the repository, so the interpreters import this qute
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# -- Each case is the code to run along with the start up options of the
+# -- vendored Qt.py to set. A cache option is given the path of the cache
+CASES = [
+    ('python', 'pass', []),
+    ('import qute', 'import qute', []),
+    ('qute.QPushButton', 'import qute; qute.QPushButton', []),
+    ('from qute import *', 'from qute import *', []),
+    ('import Qt', 'import qute.vendor.Qt', []),
+    ('+ binding cache', 'import qute.vendor.Qt', ['QT_BINDING_CACHE']),
+    ('+ lazy import', 'import qute.vendor.Qt', ['QT_LAZY_IMPORT']),
+    (
+        '+ both',
+        'import qute.vendor.Qt',
+        ['QT_BINDING_CACHE', 'QT_LAZY_IMPORT'],
+    ),
+]
+
+
+# ------------------------------------------------------------------------------
+def timed(code, runs, options=None, cache_path=None):
+    """
+    Returns the fastest number of milliseconds taken to run the given code
+    in a new interpreter, with the given Qt.py start up options set
+    """
+    environment = os.environ.copy()
+    environment['PYTHONPATH'] = os.pathsep.join(
+        [ROOT] + [path for path in [environment.get('PYTHONPATH')] if path]
+    )
+
+    for option in ['QT_BINDING_CACHE', 'QT_LAZY_IMPORT']:
+        environment.pop(option, None)
+
+    for option in options or []:
+        environment[option] = cache_path if option == 'QT_BINDING_CACHE' else '1'
+
+    # -- The first run writes the binding cache, so it is not timed
+    subprocess.check_call([sys.executable, '-c', code], env=environment)
+
+    fastest = None
+
+    for _ in range(runs):
+        started = time.time()
+        subprocess.check_call([sys.executable, '-c', code], env=environment)
+        elapsed = time.time() - started
+
+        fastest = elapsed if fastest is None else min(fastest, elapsed)
+
+    return fastest * 1000
+
+
+# ------------------------------------------------------------------------------
+def main(runs=10):
+    directory = tempfile.mkdtemp()
+
+    try:
+        for label, code, options in CASES:
+            cache_path = os.path.join(directory, '%s.json' % label)
+
+            print(
+                '%-20s: %8.1fms' % (
+                    label,
+                    timed(code, runs, options, cache_path),
+                ),
+            )
+
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
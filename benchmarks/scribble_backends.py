@@ -0,0 +1,100 @@
+"""
+Compares the throughput of the json and sqlite scribble backends when
+reading and writing many identifiers, and times migrating the data of
+those identifiers from the json backend to the sqlite backend.
+
+This does not need a Qt binding, and can be run with:
+
+    python benchmarks/scribble_backends.py
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+# -- Import scribble on its own, so that neither qute nor Qt are imported
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        'qute',
+        'vendor',
+    ),
+)
+
+from scribble import core
+
+
+# ------------------------------------------------------------------------------
+def timed(label, count, func, *args):
+    started = time.time()
+    result = func(*args)
+    elapsed = time.time() - started
+
+    print(
+        '%-28s: %8.1fms (%8.0f per second)' % (
+            label,
+            elapsed * 1000,
+            count / elapsed if elapsed else 0,
+        )
+    )
+
+    return result
+
+
+# ------------------------------------------------------------------------------
+def write(backend, identifiers, data):
+    for identifier in identifiers:
+        with backend.lock(identifier):
+            backend.write(identifier, data)
+
+
+# ------------------------------------------------------------------------------
+def read(backend, identifiers):
+    for identifier in identifiers:
+        backend.read(identifier)
+
+
+# ------------------------------------------------------------------------------
+def main(count=1000):
+    directory = tempfile.mkdtemp()
+
+    try:
+        identifiers = ['benchmark_%s' % index for index in range(count)]
+        data = dict(
+            geometry=[300, 300, 400, 400],
+            recent=['/path/to/file_%s' % index for index in range(10)],
+            enabled=True,
+        )
+
+        json_backend = core.JsonBackend(os.path.join(directory, 'json'))
+        sqlite_backend = core.SqliteBackend(os.path.join(directory, 'sqlite'))
+
+        print('%s identifiers' % count)
+
+        timed('json write', count, write, json_backend, identifiers, data)
+        timed('json read', count, read, json_backend, identifiers)
+        timed('sqlite write', count, write, sqlite_backend, identifiers, data)
+        timed('sqlite read', count, read, sqlite_backend, identifiers)
+
+        # -- Migrate into an empty database, as would happen when
+        # -- first switching from the json backend
+        migrated_backend = core.SqliteBackend(os.path.join(directory, 'migrated'))
+
+        migrated = timed(
+            'migrate json to sqlite',
+            count,
+            core.migrate,
+            json_backend,
+            migrated_backend,
+        )
+
+        print('%-28s: %s' % ('identifiers migrated', len(migrated)))
+
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Times rendering the variables of a stylesheet with a StyleTemplate compared
+to applying a regular expression substitution for every replacement, which
+is how stylesheets were previously compiled.
+
+The space stylesheet is rendered with its own variables along with an
+increasing number of additional variables, as would be the case with a
+large set of theme parameters.
+
+Run with any Qt binding available, for example:
+
+    python benchmarks/style_render.py
+"""
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qute import constants
+from qute.utilities import styling
+
+
+# ------------------------------------------------------------------------------
+def substituted(data, parameters):
+    """
+    Renders the data as it was rendered before StyleTemplate was introduced
+    """
+    for regex, replacement in parameters.items():
+        data = re.sub(regex, replacement, data)
+
+    return data
+
+
+# ------------------------------------------------------------------------------
+def timed(func, *args, **kwargs):
+    """
+    Returns the mean number of milliseconds a call of the given function
+    took
+    """
+    iterations = kwargs.get('iterations', 50)
+
+    started = time.time()
+
+    for _ in range(iterations):
+        func(*args)
+
+    return (time.time() - started) / iterations * 1000
+
+
+# ------------------------------------------------------------------------------
+def main():
+    with open(styling.available()['space'], 'r') as f:
+        data = f.read()
+
+    template = styling.StyleTemplate(data)
+
+    for count in (10, 100, 1000):
+        parameters = constants.STYLE_DEFAULTS.copy()
+
+        for index in range(count):
+            parameters['_BENCHMARK_VARIABLE_%s_' % index] = '#%06x' % index
+
+        # -- Ensure both approaches give the same result before timing them
+        assert template.render(parameters) == substituted(data, parameters)
+
+        print(
+            '%5d additional variables : re.sub %8.2fms, template %8.2fms' % (
+                count,
+                timed(substituted, data, parameters),
+                timed(template.render, parameters),
+            )
+        )
+
+
+if __name__ == '__main__':
+    main()
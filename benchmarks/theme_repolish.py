@@ -0,0 +1,95 @@
+"""
+Times swapping the theme of a window holding 1,000 widgets, comparing
+applying the compiled stylesheet to every widget individually against
+installing it once on the root through a ThemeManager.
+
+Run with any Qt binding available, for example:
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/theme_repolish.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qute.vendor import Qt
+from qute.utilities import styling
+
+
+# -- The replacements to alternate between, so every swap is a change
+THEMES = [
+    dict(_FOREGROUND_='255, 150, 0'),
+    dict(_FOREGROUND_='0, 150, 255'),
+]
+
+
+# ------------------------------------------------------------------------------
+def window(count):
+    """
+    Returns a shown window holding the given number of widgets, along
+    with those widgets
+    """
+    root = Qt.QtWidgets.QWidget()
+    layout = Qt.QtWidgets.QVBoxLayout(root)
+
+    widgets = list()
+
+    for index in range(count // 2):
+        label = Qt.QtWidgets.QLabel('Label %s' % index)
+        button = Qt.QtWidgets.QPushButton('Button %s' % index)
+
+        layout.addWidget(label)
+        layout.addWidget(button)
+
+        widgets.extend([label, button])
+
+    root.show()
+
+    return root, widgets
+
+
+# ------------------------------------------------------------------------------
+def perWidget(root, widgets, swaps):
+    for swap in range(swaps):
+        for widget in widgets:
+            styling.apply('space', widget, **THEMES[swap % 2])
+
+        Qt.QtWidgets.QApplication.processEvents()
+
+
+# ------------------------------------------------------------------------------
+def themed(root, widgets, swaps):
+    manager = styling.ThemeManager(root)
+
+    for swap in range(swaps):
+        manager.setTheme('space', **THEMES[swap % 2])
+
+        Qt.QtWidgets.QApplication.processEvents()
+
+
+# ------------------------------------------------------------------------------
+def main(count=1000, swaps=10):
+    q_app = Qt.QtWidgets.QApplication.instance() or Qt.QtWidgets.QApplication(sys.argv)
+
+    for label, func in [('per widget', perWidget), ('theme manager', themed)]:
+        root, widgets = window(count)
+        q_app.processEvents()
+
+        started = time.time()
+        func(root, widgets, swaps)
+        elapsed = time.time() - started
+
+        print(
+            '%-14s: %8.1fms per theme swap of %s widgets' % (
+                label,
+                elapsed / swaps * 1000,
+                count,
+            )
+        )
+
+        root.close()
+
+
+if __name__ == '__main__':
+    main()
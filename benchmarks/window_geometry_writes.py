@@ -0,0 +1,81 @@
+"""
+Counts how many times a MemorableWindow writes its geometry to disk whilst
+being dragged and resized, compared to the number of geometry changes it
+receives (which is how many writes it made before the writes were
+debounced).
+
+Run with any Qt binding available, for example:
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/window_geometry_writes.py
+"""
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# -- Keep the benchmark from touching the real scribble data
+os.environ['PYSCRIBBLE_STORAGE_DIR'] = tempfile.mkdtemp()
+
+from qute.vendor import Qt
+from qute.vendor.scribble import core
+from qute.extensions import windows
+
+
+# ------------------------------------------------------------------------------
+def main(steps=500):
+    q_app = Qt.QtWidgets.QApplication.instance() or Qt.QtWidgets.QApplication(sys.argv)
+
+    # -- Count every write made to disk
+    counts = dict(writes=0, changes=0)
+    original_save = core.ScribbleDictionary.save
+
+    def counted_save(self):
+        counts['writes'] += 1
+        return original_save(self)
+
+    core.ScribbleDictionary.save = counted_save
+
+    original_store = windows.MemorableWindow.storeSize
+
+    def counted_store(self):
+        counts['changes'] += 1
+        return original_store(self)
+
+    windows.MemorableWindow.storeSize = counted_store
+
+    window = windows.MemorableWindow(identifier='benchmark_window')
+    window.show()
+    q_app.processEvents()
+
+    counts['writes'] = 0
+    counts['changes'] = 0
+
+    # -- Simulate an interactive drag and resize, with events being
+    # -- processed between each step as they would be
+    started = time.time()
+
+    for step in range(steps):
+        window.move(100 + step, 100 + step // 2)
+        window.resize(400 + step, 300 + step // 3)
+        q_app.processEvents()
+
+    elapsed = time.time() - started
+
+    # -- Let the debounce timer trigger
+    deadline = time.time() + (windows.MemorableWindow._STORE_DELAY / 1000.0) * 2
+
+    while time.time() < deadline:
+        q_app.processEvents()
+        time.sleep(0.01)
+
+    print('geometry changes : %s' % counts['changes'])
+    print('disk writes      : %s (previously one per change)' % counts['writes'])
+    print('interaction time : %.1fms' % (elapsed * 1000))
+
+    window.close()
+
+
+if __name__ == '__main__':
+    main()
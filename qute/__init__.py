@@ -30,53 +30,149 @@ __copyright__ = "Copyright (C) 2019 Michael Malinowski"
 __license__ = "MIT"
 __version__ = "4.0.1"
 
-#import imp
-
-# -- Import all our Qt variables into this namespace - which
-# -- makes it trivial to use later
-from .vendor.Qt.QtCore import *
-from .vendor.Qt.QtGui import *
-from .vendor.Qt.QtWidgets import *
-from .vendor.Qt import QtCompat
-
-from . import extensions
-from . import utilities
-from . import constants
-
+import sys
+import importlib
+
+# -- These are the submodules of qute. Rather than importing them all
+# -- up front (along with everything they import) they are imported
+# -- the first time they are accessed
+_SUBMODULES = [
+    'constants',
+    'extensions',
+    'resources',
+    'utilities',
+    'vendor',
+]
+
+# -- All our Qt variables are exposed in this namespace - which makes it
+# -- trivial to use later. These are resolved on first access, with the
+# -- first module containing the name taking precedence.
+_QT_MODULES = [
+    'QtWidgets',
+    'QtGui',
+    'QtCore',
+]
 
 # ------------------------------------------------------------------------------
-# All imports below this line are deprecated imports which are still exposed
-# for backward compatibility between version 1.0.11 and 2.0.1
-# You should not use these imports.
-
-# -- We import QtCompat explicitly
-
-from .utilities.layouts import slimify
-from .utilities import qApp
-from .utilities.pixmaps import toGrayscale
-from .utilities.layouts import empty as emptyLayout
-from .utilities.widgets import addLabel
-from .utilities.widgets import getComboIndex
-from .utilities.widgets import setComboByText
+# The names below are deprecated names which are still exposed for backward
+# compatibility between version 1.0.11 and 2.0.1. You should not use these.
+# Each is resolved on first access from the module and attribute given.
+_DEPRECATED = dict(
+    slimify=('.utilities.layouts', 'slimify'),
+    qApp=('.utilities', 'qApp'),
+    toGrayscale=('.utilities.pixmaps', 'toGrayscale'),
+    emptyLayout=('.utilities.layouts', 'empty'),
+    addLabel=('.utilities.widgets', 'addLabel'),
+    getComboIndex=('.utilities.widgets', 'getComboIndex'),
+    setComboByText=('.utilities.widgets', 'setComboByText'),
+    applyStyle=('.utilities.styling', 'apply'),
+    getCompoundedStylesheet=('.utilities.styling', 'getCompoundedStylesheet'),
+    menuFromDictionary=('.utilities.menus', 'menuFromDictionary'),
+    deriveWidget=('.utilities.derive', 'deriveWidget'),
+    deriveValue=('.utilities.derive', 'deriveValue'),
+    setBlindValue=('.utilities.derive', 'setBlindValue'),
+    connectBlind=('.utilities.derive', 'connectBlind'),
+    mainWindow=('.utilities.windows', 'mainWindow'),
+    MemorableWindow=('.extensions.windows', 'MemorableWindow'),
+    printEventName=('.utilities.events', 'printEventName'),
+    loadUi=('.utilities.designer', 'load'),
+    quick_app=('.utilities.launch', 'quick_app'),
+    TimedProcessorTray=('.extensions.tray', 'TimedProcessorTray'),
+    MemorableTimedProcessorTray=('.extensions.tray', 'MemorableTimedProcessorTray'),
+)
 
-from .utilities.styling import apply as applyStyle
-from .utilities.styling import getCompoundedStylesheet
 
-from .utilities.menus import menuFromDictionary
-
-from .utilities.derive import deriveWidget
-from .utilities.derive import deriveValue
-from .utilities.derive import setBlindValue
-from .utilities.derive import connectBlind
+# ------------------------------------------------------------------------------
+def __getattr__(name):
+    """
+    Resolves submodules, Qt variables and deprecated names on first access,
+    storing them in this namespace so they are only resolved once.
+    """
+    # -- The names exported by a star import include every Qt variable,
+    # -- so they are only gathered if a star import is actually made
+    if name == '__all__':
+        value = sorted(set(_SUBMODULES) | set(_DEPRECATED) | _qtNames())
+
+        globals()[name] = value
+        return value
+
+    if name.startswith('_'):
+        raise AttributeError(
+            'module %s has no attribute %s' % (__name__, name),
+        )
+
+    if name in _SUBMODULES:
+        value = importlib.import_module('.' + name, __name__)
+
+    elif name in _DEPRECATED:
+        module_name, attribute_name = _DEPRECATED[name]
+        value = getattr(
+            importlib.import_module(module_name, __name__),
+            attribute_name,
+        )
+
+    elif name == 'QtCompat':
+        from .vendor.Qt import QtCompat as value
+
+    else:
+        for qt_module_name in _QT_MODULES:
+            qt_module = importlib.import_module(
+                '.vendor.Qt.' + qt_module_name,
+                __name__,
+            )
+
+            if hasattr(qt_module, name):
+                value = getattr(qt_module, name)
+                break
+
+        else:
+            raise AttributeError(
+                'module %s has no attribute %s' % (__name__, name),
+            )
+
+    globals()[name] = value
+    return value
 
-from .utilities.windows import mainWindow
-from .extensions.windows import MemorableWindow
 
-from .utilities.events import printEventName
+# ------------------------------------------------------------------------------
+def __dir__():
+    names = set(globals())
+    names.update(_SUBMODULES)
+    names.update(_DEPRECATED)
+    names.update(_qtNames())
 
-from .utilities.designer import load as loadUi
+    return sorted(names)
 
-from .utilities.launch import quick_app
 
-from .extensions.tray import TimedProcessorTray
-from .extensions.tray import MemorableTimedProcessorTray
+# ------------------------------------------------------------------------------
+def _qtNames():
+    """
+    Returns the names of all the Qt variables exposed in this namespace,
+    along with QtCompat
+    """
+    names = set(['QtCompat'])
+
+    for qt_module_name in _QT_MODULES:
+        qt_module = importlib.import_module(
+            '.vendor.Qt.' + qt_module_name,
+            __name__,
+        )
+        names.update(
+            name
+            for name in dir(qt_module)
+            if not name.startswith('_')
+        )
+
+    return names
+
+
+# -- Module level __getattr__ is only supported from python 3.7, so on
+# -- earlier versions we have to resolve everything up front
+if sys.version_info < (3, 7):
+    from .vendor.Qt.QtCore import *
+    from .vendor.Qt.QtGui import *
+    from .vendor.Qt.QtWidgets import *
+    from .vendor.Qt import QtCompat
+
+    for _name in _SUBMODULES + sorted(_DEPRECATED) + ['__all__']:
+        __getattr__(_name)
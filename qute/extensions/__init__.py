@@ -1,6 +1,29 @@
+import sys
+import importlib
 
-from . import windows
-from . import dividers
-from . import buttons
-from . import tray
-from . import flow_layout
+# -- These are the submodules of extensions. They are imported the first
+# -- time they are accessed rather than up front
+_SUBMODULES = [
+    'windows',
+    'dividers',
+    'buttons',
+    'tray',
+    'flow_layout',
+]
+
+
+# ------------------------------------------------------------------------------
+def __getattr__(name):
+    if name not in _SUBMODULES:
+        raise AttributeError(
+            'module %s has no attribute %s' % (__name__, name),
+        )
+
+    return importlib.import_module('.' + name, __name__)
+
+
+# -- Module level __getattr__ is only supported from python 3.7, so on
+# -- earlier versions we have to import everything up front
+if sys.version_info < (3, 7):
+    for _name in _SUBMODULES:
+        __getattr__(_name)
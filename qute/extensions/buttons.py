@@ -16,9 +16,7 @@ class CopyToClipboardButton(Qt.QtWidgets.QPushButton):
 
         # -- Set an icon
         self.setIcon(
-            Qt.QtGui.QIcon(
-                resources.get('copy_to_clipboard.png'),
-            )
+            resources.icon('copy_to_clipboard.png'),
         )
 
         # -- Fix the size of the button if requested
@@ -5,14 +5,33 @@ Just added comments on the offical PySide example.
 @date 08-2013
 @source http://josbalcaen.com/pyqt-flowlayout-maya-python/
 """""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
+import collections
+
 from ..vendor import Qt
+from .. import utilities
 
 
 
 class FlowLayout(Qt.QtWidgets.QLayout):
-    """Custom layout that mimics the behaviour of a flow layout"""
+    """Custom layout that mimics the behaviour of a flow layout
+
+    Item size hints are cached until the layout is invalidated, and the
+    flow (the position of every item) is cached for the most recently used
+    widths. When the size hints change, only the items from the line
+    holding the last unchanged item onwards are re-flowed, and only those
+    items are moved.
+    """
+
+    # The number of widths to hold a flow for
+    FLOW_CACHE_LIMIT = 4
+
+    # The number of widths to memoize heightForWidth for
+    HEIGHT_CACHE_LIMIT = 256
 
     def __init__(self, parent=None, margin=0, spacing=-1):
+        self.itemList = []
+        self._resetCache()
+
         super(FlowLayout, self).__init__(parent)
 
         self._margin = 0
@@ -22,22 +41,27 @@ class FlowLayout(Qt.QtWidgets.QLayout):
 
         self.setSpacing(spacing)
 
-        self.itemList = []
-
     def margin(self):
         return self._margin
 
     def setMargin(self, value):
         self._margin = value
+        self.invalidate()
 
     def __del__(self):
-        item = self.takeAt(0)
-        while item:
-            item = self.takeAt(0)
+        # The underlying layout may already be deleted, so we drop the
+        # items directly rather than through takeAt
+        del self.itemList[:]
 
     def addItem(self, item):
         self.itemList.append(item)
 
+        # Appending an item does not affect the size hints we already hold,
+        # so only the hint of the new item needs reading
+        self._heights = dict()
+        self._minimum_size = None
+        super(FlowLayout, self).invalidate()
+
     def count(self):
         return len(self.itemList)
 
@@ -48,12 +72,17 @@ class FlowLayout(Qt.QtWidgets.QLayout):
 
     def takeAt(self, index):
         if index >= 0 and index < len(self.itemList):
-            return self.itemList.pop(index)
+            item = self.itemList.pop(index)
+            self.invalidate()
+            self._applied_flow = None
+            return item
         return None
 
     def insertWidget(self, index, widget):
         item = Qt.QtWidgets.QWidgetItem(widget)
         self.itemList.insert(index, item)
+        self.invalidate()
+        self._applied_flow = None
 
     def expandingDirections(self):
         return Qt.QtCore.Qt.Orientations(Qt.QtCore.Qt.Horizontal)
@@ -62,7 +91,18 @@ class FlowLayout(Qt.QtWidgets.QLayout):
         return True
 
     def heightForWidth(self, width):
-        height = self.doLayout(Qt.QtCore.QRect(0, 0, width, 0), True)
+        self._updateSizeHints()
+
+        height = self._heights.get(width)
+
+        if height is None:
+            height = self._flow(width)['height']
+
+            if len(self._heights) >= self.HEIGHT_CACHE_LIMIT:
+                self._heights.clear()
+
+            self._heights[width] = height
+
         return height
 
     def setGeometry(self, rect):
@@ -73,6 +113,9 @@ class FlowLayout(Qt.QtWidgets.QLayout):
         return self.minimumSize()
 
     def minimumSize(self):
+        if self._minimum_size is not None:
+            return Qt.QtCore.QSize(self._minimum_size)
+
         # Calculate the size
         size = Qt.QtCore.QSize()
 
@@ -82,28 +125,338 @@ class FlowLayout(Qt.QtWidgets.QLayout):
         # Add the margins
         size += Qt.QtCore.QSize(2 * self.margin(), 2 * self.margin())
 
-        return size
+        self._minimum_size = size
+
+        return Qt.QtCore.QSize(size)
+
+    def invalidate(self):
+        # The size hints of any item may have changed, so they are
+        # re-read the next time they are needed. The flows are kept, so
+        # that only the items after the first changed hint are re-flowed
+        self._hints_dirty = True
+        self._heights = dict()
+        self._minimum_size = None
+
+        super(FlowLayout, self).invalidate()
 
     def doLayout(self, rect, testOnly):
-        x = rect.x()
-        y = rect.y()
-        lineHeight = 0
+        flow = self._flow(rect.width())
+
+        if not testOnly:
+            self._applyFlow(rect, flow)
+
+        return flow['height']
+
+    def _resetCache(self):
+        """Clears all cached size hints, flows and geometry"""
+        self._hints = []
+        self._hints_dirty = True
+        self._flows = collections.OrderedDict()
+        self._heights = dict()
+        self._minimum_size = None
+        self._applied_flow = None
+
+    def _updateSizeHints(self):
+        """Re-reads the size hints of the items if they have been invalidated,
+        marking each flow as needing to be re-flowed from the first item
+        whose size hint has changed"""
+        if not self._hints_dirty and len(self._hints) == len(self.itemList):
+            return self._hints
+
+        # If items have only been appended, only their hints need reading
+        if not self._hints_dirty and len(self._hints) < len(self.itemList):
+            changed = len(self._hints)
+
+            for item in self.itemList[changed:]:
+                hint = item.sizeHint()
+                self._hints.append((hint.width(), hint.height()))
+
+            for flow in self._flows.values():
+                flow['changed'] = min(flow['changed'], changed)
+
+            return self._hints
+
+        hints = []
 
         for item in self.itemList:
-            wid = item.widget()
-            spaceX = self.spacing()
-            spaceY = self.spacing()
-            nextX = x + item.sizeHint().width() + spaceX
-            if nextX - spaceX > rect.right() and lineHeight > 0:
-                x = rect.x()
-                y = y + lineHeight + spaceY
-                nextX = x + item.sizeHint().width() + spaceX
+            hint = item.sizeHint()
+            hints.append((hint.width(), hint.height()))
+
+        # Positions only depend on the sequence of size hints, so we only
+        # need to find the first hint which differs
+        changed = min(len(hints), len(self._hints))
+
+        for index, (old, new) in enumerate(zip(self._hints, hints)):
+            if old != new:
+                changed = index
+                break
+
+        if changed < len(hints) or len(hints) != len(self._hints):
+            for flow in self._flows.values():
+                flow['changed'] = min(flow['changed'], changed)
+
+            self._heights = dict()
+
+        self._hints = hints
+        self._hints_dirty = False
+
+        return hints
+
+    def _flow(self, width):
+        """Returns the flow of the items within the given width, re-flowing
+        only what has changed since it was last calculated. The flow holds
+        the position of each item relative to the top left of the layout
+        rect, the index of the first item of each item's line and the
+        overall height."""
+        hints = self._updateSizeHints()
+        spacing = self.spacing()
+
+        flow = self._flows.pop(width, None)
+
+        if flow is None or flow['spacing'] != spacing:
+            flow = dict(
+                spacing=spacing,
+                positions=[],
+                line_starts=[],
+                height=0,
+                changed=0,
+                unapplied=0,
+            )
+
+        self._flows[width] = flow
+
+        while len(self._flows) > self.FLOW_CACHE_LIMIT:
+            self._flows.popitem(last=False)
+
+        positions = flow['positions']
+        line_starts = flow['line_starts']
+
+        changed = min(flow['changed'], len(hints), len(positions))
+
+        if changed == len(hints) == len(positions):
+            return flow
+
+        # Re-flow from the start of the line holding the last unchanged
+        # item, as a changed item may now fit onto the end of that line.
+        # Everything before that line is unaffected
+        anchor = min(changed - 1, len(hints) - 1, len(positions) - 1)
+
+        start = line_starts[anchor] if anchor >= 0 else 0
+        y = positions[start][1] if anchor >= 0 else 0
+
+        del positions[start:]
+        del line_starts[start:]
+
+        x = 0
+        line_start = start
+        lineHeight = 0
+        right = width - 1
+
+        for index in range(start, len(hints)):
+            item_width, item_height = hints[index]
+
+            nextX = x + item_width + spacing
+            if nextX - spacing > right and lineHeight > 0:
+                x = 0
+                y = y + lineHeight + spacing
+                nextX = item_width + spacing
                 lineHeight = 0
+                line_start = index
 
-            if not testOnly:
-                item.setGeometry(Qt.QtCore.QRect(Qt.QtCore.QPoint(x, y), item.sizeHint()))
+            positions.append((x, y))
+            line_starts.append(line_start)
 
             x = nextX
-            lineHeight = max(lineHeight, item.sizeHint().height())
+            lineHeight = max(lineHeight, item_height)
+
+        flow['height'] = y + lineHeight
+        flow['changed'] = len(hints)
+        flow['unapplied'] = min(flow['unapplied'], start)
+
+        return flow
+
+    def _applyFlow(self, rect, flow):
+        """Sets the geometry of the items. If this flow was the last one
+        applied at the same position, only the items it has re-flowed since
+        then are moved"""
+        hints = self._hints
+        positions = flow['positions']
+
+        origin = (rect.x(), rect.y())
+        begin = 0
+
+        if self._applied_flow and self._applied_flow[0] == origin and self._applied_flow[1] is flow:
+            begin = flow['unapplied']
+
+        for index in range(begin, len(self.itemList)):
+            x, y = positions[index]
+            width, height = hints[index]
+
+            self.itemList[index].setGeometry(
+                Qt.QtCore.QRect(origin[0] + x, origin[1] + y, width, height),
+            )
+
+        flow['unapplied'] = len(positions)
+        self._applied_flow = (origin, flow)
+
+
+class FlowModel(Qt.QtCore.QAbstractListModel):
+    """List model which exposes a list of plain data items to a FlowView
+
+    The label, icon and tooltip of each item are only resolved when the
+    view asks for them, which is only for the items which are visible. Each
+    is given as a callable which is passed the data item. The icon may
+    return a QIcon, a QPixmap or a path to an image, and paths are loaded
+    through the shared icon cache.
+    """
+
+    def __init__(self, items=None, label=None, icon=None, tooltip=None, item_size=None, parent=None):
+        super(FlowModel, self).__init__(parent)
+
+        self._items = list(items or [])
+
+        self._label = label or str
+        self._icon = icon
+        self._tooltip = tooltip
+
+        self._item_size = None
+        if item_size is not None:
+            self._item_size = Qt.QtCore.QSize(*item_size) if isinstance(item_size, (tuple, list)) else item_size
+
+    def rowCount(self, parent=Qt.QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._items)
+
+    def data(self, index, role=Qt.QtCore.Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._items):
+            return None
+
+        item = self._items[index.row()]
+
+        if role == Qt.QtCore.Qt.DisplayRole:
+            return self._label(item)
+
+        if role == Qt.QtCore.Qt.DecorationRole and self._icon:
+            icon = self._icon(item)
+            if isinstance(icon, str):
+                return utilities.icons.icon(icon)
+            return icon
+
+        if role == Qt.QtCore.Qt.ToolTipRole and self._tooltip:
+            return self._tooltip(item)
+
+        if role == Qt.QtCore.Qt.SizeHintRole and self._item_size is not None:
+            return self._item_size
+
+        if role == Qt.QtCore.Qt.UserRole:
+            return item
+
+        return None
+
+    def items(self):
+        return list(self._items)
+
+    def item(self, row):
+        return self._items[row]
+
+    def setItems(self, items):
+        self.beginResetModel()
+        self._items = list(items)
+        self.endResetModel()
+
+    def addItems(self, items):
+        items = list(items)
+        if not items:
+            return
+
+        self.beginInsertRows(Qt.QtCore.QModelIndex(), len(self._items), len(self._items) + len(items) - 1)
+        self._items.extend(items)
+        self.endInsertRows()
+
+    def removeItem(self, row):
+        self.beginRemoveRows(Qt.QtCore.QModelIndex(), row, row)
+        self._items.pop(row)
+        self.endRemoveRows()
+
+
+class FlowView(Qt.QtWidgets.QListView):
+    """Virtualized alternative to a FlowLayout for very large item counts
+
+    Items are flowed left to right and wrapped onto a new line when they
+    exceed the width of the view, with the given spacing between them, in
+    the same way as a FlowLayout. Rather than every item being a widget,
+    the items are rows of a model which are drawn by a single delegate,
+    and only the visible rows are drawn.
+
+    If every item is the same size, passing item_size allows the view to
+    lay out the items without asking each one for its size.
+    """
+
+    itemActivated = Qt.QtCore.Signal(object)
+
+    def __init__(self, parent=None, spacing=-1, item_size=None):
+        super(FlowView, self).__init__(parent)
+
+        self.setViewMode(Qt.QtWidgets.QListView.IconMode)
+        self.setFlow(Qt.QtWidgets.QListView.LeftToRight)
+        self.setWrapping(True)
+        self.setMovement(Qt.QtWidgets.QListView.Static)
+        self.setResizeMode(Qt.QtWidgets.QListView.Adjust)
+
+        # Lay out the items in batches so that large models do not block
+        # the ui whilst being laid out
+        self.setLayoutMode(Qt.QtWidgets.QListView.Batched)
+        self.setBatchSize(200)
+
+        # A negative spacing uses the default spacing of the style, as
+        # it does for a FlowLayout
+        if spacing < 0:
+            spacing = self.style().pixelMetric(Qt.QtWidgets.QStyle.PM_LayoutHorizontalSpacing)
+        self.setSpacing(max(spacing, 0))
+
+        self._item_size = item_size
+        self.setUniformItemSizes(item_size is not None)
+
+        self.activated.connect(self._emitItemActivated)
+
+    def setItems(self, items, label=None, icon=None, tooltip=None):
+        """Shows the given data items, creating a FlowModel for them"""
+        self.setModel(
+            FlowModel(
+                items,
+                label=label,
+                icon=icon,
+                tooltip=tooltip,
+                item_size=self._item_size,
+                parent=self,
+            ),
+        )
+
+    def selectedItems(self):
+        """Returns the data items which are selected"""
+        return [
+            index.data(Qt.QtCore.Qt.UserRole)
+            for index in self.selectionModel().selectedIndexes()
+        ]
+
+    def _emitItemActivated(self, index):
+        self.itemActivated.emit(index.data(Qt.QtCore.Qt.UserRole))
+
+
+def flowViewFromItems(items, label=None, icon=None, tooltip=None, item_size=None, spacing=-1, parent=None):
+    """Creates a FlowView showing the given list of data items
 
-        return y + lineHeight - rect.y()
+    :param items: The data items to show
+    :param label: Callable returning the label of a data item
+    :param icon: Callable returning the icon (QIcon, QPixmap or path) of a
+        data item
+    :param tooltip: Callable returning the tooltip of a data item
+    :param item_size: The size of every item, if they are all the same size
+    :param spacing: The spacing between items
+    :param parent: The parent widget
+    :return: FlowView
+    """
+    view = FlowView(parent=parent, spacing=spacing, item_size=item_size)
+    view.setItems(items, label=label, icon=icon, tooltip=tooltip)
+    return view
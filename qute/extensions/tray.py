@@ -1,12 +1,44 @@
 """
 Holds System Tray utilities and classes
 """
+import os
 import sys
-import functools
+import json
+import time
+import pstats
+import random
+import cProfile
+import logging
 import datetime
+import functools
+import threading
+import itertools
+import traceback
+import collections
+
+try:
+    import queue
+
+except ImportError:
+    import Queue as queue
+
+try:
+    from StringIO import StringIO
+
+except ImportError:
+    from io import StringIO
+
+# -- concurrent.futures is only required when processing in parallel. Under
+# -- Python 2 it is available through the futures package
+try:
+    import concurrent.futures as futures
+
+except ImportError:
+    futures = None
 
 from ..vendor import scribble
 from ..vendor import Qt
+from .. import constants
 from .. import utilities
 
 
@@ -14,6 +46,16 @@ from .. import utilities
 # noinspection PyUnresolvedReferences
 class LogWindow(Qt.QtWidgets.QMainWindow):
 
+    # -- These are the levels the user can choose to filter the logs by
+    LEVELS = [
+        ('All', logging.NOTSET),
+        ('Debug', logging.DEBUG),
+        ('Info', logging.INFO),
+        ('Warning', logging.WARNING),
+        ('Error', logging.ERROR),
+        ('Critical', logging.CRITICAL),
+    ]
+
     # --------------------------------------------------------------------------
     def __init__(self, parent=None):
         super(LogWindow, self).__init__(parent=parent)
@@ -21,21 +63,43 @@ class LogWindow(Qt.QtWidgets.QMainWindow):
         # -- Define a title expressing what the window is
         self.setWindowTitle('Logs')
 
-        # -- We only need one widget - a text window
-        self.text_edit = Qt.QtWidgets.QTextEdit()
+        # -- Add the filter options above the logs
+        self.level_filter = Qt.QtWidgets.QComboBox()
+
+        for label, level in self.LEVELS:
+            self.level_filter.addItem(label, level)
+
+        self.search_filter = Qt.QtWidgets.QLineEdit()
+        self.search_filter.setPlaceholderText('Search')
+
+        filter_layout = Qt.QtWidgets.QHBoxLayout()
+        filter_layout.addWidget(self.level_filter)
+        filter_layout.addWidget(self.search_filter)
+
+        # -- Add the text window. Limiting the block count means the
+        # -- oldest lines are dropped from the top as new ones are
+        # -- appended, rather than re-laying out the whole document
+        self.text_edit = Qt.QtWidgets.QPlainTextEdit()
         self.text_edit.setReadOnly(True)
         self.text_edit.setLineWrapMode(self.text_edit.NoWrap)
+        self.text_edit.setMaximumBlockCount(OutputStream.MAX_ENTRIES)
 
-        # -- Drop in the logs
-        self.text_edit.document().setPlainText(''.join(OutputStream.Logs))
-        self.setCentralWidget(self.text_edit)
+        layout = Qt.QtWidgets.QVBoxLayout()
+        layout.addLayout(filter_layout)
+        layout.addWidget(self.text_edit)
+
+        self.setCentralWidget(Qt.QtWidgets.QWidget())
+        self.centralWidget().setLayout(layout)
 
         # -- Make it pretty and consistent with our styling
         utilities.styling.apply(['space'], self)
 
-        # -- Track the log count
+        # -- Track the sequence number of the last log we have displayed
         self.log_count = 0
 
+        # -- Drop in the logs
+        self.updateEntries()
+
         # -- To prevent us from having to deal with emissions from
         # -- different threads, and thread safety we simply update
         # -- the view on a timer
@@ -45,24 +109,70 @@ class LogWindow(Qt.QtWidgets.QMainWindow):
         self._timer.timeout.connect(self.updateEntries)
         self._timer.start()
 
+        # -- Changing the filters means re-populating the view, so we
+        # -- wait for the user to stop typing before doing so
+        self._filter_timer = Qt.QtCore.QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(250)
+        self._filter_timer.timeout.connect(self.refilter)
+
+        self.level_filter.currentIndexChanged.connect(self.refilter)
+        self.search_filter.textChanged.connect(self._filter_timer.start)
+
     # --------------------------------------------------------------------------
     def updateEntries(self):
         """
-        Triggers an update of the logs, based on the log stream
+        Triggers an update of the logs, based on the log stream. Only the
+        entries written since the last update are appended.
+
+        :return:
+        """
+        # -- If no logs have been written since we last looked, there
+        # -- is nothing for us to do
+        new_entries = OutputStream.Logs.since(self.log_count)
+
+        if not new_entries:
+            return
+
+        # -- Store the sequence of the last log we have dealt with, so we
+        # -- can see if anything needs updating next time around
+        self.log_count = new_entries[-1].sequence
+
+        self._appendEntries(new_entries)
+
+    # --------------------------------------------------------------------------
+    def refilter(self):
+        """
+        Re-populates the view with all the held logs which match the
+        current filters.
 
         :return:
         """
-        # -- If the amount of logs has not changed, we do nothing
-        # if self.log_count == len(OutputStream.Logs):
-        #     return
+        self._filter_timer.stop()
+
+        self.text_edit.clear()
+        self.log_count = 0
+
+        self.updateEntries()
+
+    # --------------------------------------------------------------------------
+    def _appendEntries(self, entries):
+        """
+        Appends the given entries which match the current filters to the
+        view as a single edit. The view will only follow the new entries
+        if it was already at the bottom.
+        """
+        level = self.level_filter.itemData(self.level_filter.currentIndex())
+        search = self.search_filter.text()
 
-        # -- Set the text of the logs
-        self.text_edit.document().setPlainText(''.join(OutputStream.Logs))
-        self.text_edit.ensureCursorVisible()
+        lines = [
+            entry.format()
+            for entry in entries
+            if entry.matches(level, search)
+        ]
 
-        # -- Store how many logs we have dealt with, so we can see
-        # -- if anything needs updating next time around
-        self.log_count = len(OutputStream.Logs)
+        if lines:
+            self.text_edit.appendPlainText('\n'.join(lines))
 
     # --------------------------------------------------------------------------
     def hideEvent(self, *args, **kwargs):
@@ -76,40 +186,317 @@ class LogWindow(Qt.QtWidgets.QMainWindow):
     # --------------------------------------------------------------------------
     def showEvent(self, *args, **kwargs):
         """
-        When the window is hidden, we do not need to update the view
+        When the window is shown we bring the view up to date and resume
+        updating it
 
         :return:
         """
+        self.updateEntries()
         self._timer.start()
 
 
 # ------------------------------------------------------------------------------
-class OutputStream(object):
+class LogEntry(collections.namedtuple('LogEntry', 'sequence timestamp text level name thread')):
+    """
+    A single entry within a LogBuffer. The timestamp is stored as seconds
+    since the epoch and only formatted when the entry is displayed.
+    """
+    __slots__ = ()
+
+    # --------------------------------------------------------------------------
+    def format(self):
+        """
+        Returns the entry as a line of text, prefixed with its time, level
+        and the name of the logger it came from
+
+        :return: str
+        """
+        return '%s :: %s :: %s :: %s' % (
+            datetime.datetime.fromtimestamp(self.timestamp),
+            logging.getLevelName(self.level),
+            self.name,
+            self.text,
+        )
+
+    # --------------------------------------------------------------------------
+    def matches(self, level=logging.NOTSET, search=None):
+        """
+        Checks whether this entry is of at least the given level and
+        contains the given search text (regardless of case).
+
+        :param level: The minimum level
+        :type level: int
+
+        :param search: Text to search for
+        :type search: str
+
+        :return: bool
+        """
+        if self.level < (level or logging.NOTSET):
+            return False
+
+        if search and search.lower() not in self.text.lower():
+            return False
+
+        return True
+
+
+# ------------------------------------------------------------------------------
+class LogBuffer(object):
     """
-    Log class to retrieve log information from
+    Thread safe, fixed capacity buffer of log entries. Once full, appending
+    an entry drops the oldest one.
+
+    Every entry is given a sequence number which increases with each entry
+    appended, allowing readers to retrieve only the entries appended since
+    they last looked.
+
+    :param max_entries: The number of entries to hold
+    :type max_entries: int
     """
-    Logs = list()
 
+    # --------------------------------------------------------------------------
+    def __init__(self, max_entries):
+        self._entries = collections.deque(maxlen=max_entries)
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    # --------------------------------------------------------------------------
+    def append(self, text, timestamp=None, level=logging.INFO, name='', thread=None):
+        """
+        Adds an entry to the buffer
+
+        :param text: The text to log
+        :type text: str
+
+        :param timestamp: The time (in seconds since the epoch) of the entry.
+            If not given the current time is used.
+        :type timestamp: float
+
+        :param level: The logging level of the entry
+        :type level: int
+
+        :param name: The name of the logger the entry came from
+        :type name: str
+
+        :param thread: The name of the thread the entry came from. If not
+            given the current thread is used.
+        :type thread: str
+
+        :return: The sequence number of the entry
+        """
+        if timestamp is None:
+            timestamp = time.time()
+
+        if thread is None:
+            thread = threading.current_thread().name
+
+        with self._lock:
+            self._sequence += 1
+            self._entries.append(
+                LogEntry(self._sequence, timestamp, text, level, name, thread),
+            )
+
+            return self._sequence
+
+    # --------------------------------------------------------------------------
+    def sequence(self):
+        """
+        Returns the sequence number of the most recently appended entry, or
+        zero if nothing has been appended.
+
+        :return: int
+        """
+        return self._sequence
+
+    # --------------------------------------------------------------------------
+    def since(self, sequence):
+        """
+        Returns all the entries held which were appended after the entry
+        with the given sequence number, oldest first. Only the entries
+        returned are visited.
+
+        :param sequence: The sequence number of the last entry already seen
+        :type sequence: int
+
+        :return: list(LogEntry, ...)
+        """
+        with self._lock:
+            count = min(self._sequence - sequence, len(self._entries))
+
+            if count <= 0:
+                return list()
+
+            entries = list(itertools.islice(reversed(self._entries), count))
+
+        entries.reverse()
+        return entries
+
+    # --------------------------------------------------------------------------
+    def clear(self):
+        """
+        Removes all the entries. Sequence numbers are not reset.
+
+        :return: None
+        """
+        with self._lock:
+            self._entries.clear()
+
+    # --------------------------------------------------------------------------
+    def __len__(self):
+        return len(self._entries)
+
+    # --------------------------------------------------------------------------
+    def __iter__(self):
+        # -- For compatibility each entry is given as a formatted line
+        # -- starting with a newline, so joining them gives the full log
+        with self._lock:
+            entries = list(self._entries)
+
+        for entry in entries:
+            yield '\n' + entry.format()
+
+
+# ------------------------------------------------------------------------------
+class OutputStream(object):
+    """
+    Log class to retrieve log information from. This can be used in place
+    of sys.stdout or sys.stderr.
+    """
     MAX_ENTRIES = 10000
 
+    Logs = LogBuffer(MAX_ENTRIES)
+
+    # --------------------------------------------------------------------------
+    def __init__(self, name='stdout', level=logging.INFO):
+        self.name = name
+        self.level = level
+
     # --------------------------------------------------------------------------
     def write(self, text_):
+        if isinstance(text_, bytes):
+            text_ = text_.decode('utf-8', 'replace')
+
         if not text_.strip():
             return
-        try:
-            text_ = text_.decode('ascii')
-        except:
-            return
-        OutputStream.Logs.append('\n' + str(datetime.datetime.now()) + ' :: ' + text_.strip())
-        OutputStream.Logs = OutputStream.Logs[len(OutputStream.Logs) - OutputStream.MAX_ENTRIES:]
+
+        OutputStream.Logs.append(
+            text_.strip(),
+            level=self.level,
+            name=self.name,
+        )
+
+    # --------------------------------------------------------------------------
+    def flush(self):
+        pass
+
+
+# ------------------------------------------------------------------------------
+class LogHandler(logging.Handler):
+    """
+    A logging handler which feeds records into the tray logs, allowing
+    them to be viewed in the LogWindow.
+
+    Emitting a record only places it on a queue. The records are formatted
+    and stored by a background thread, so logging calls do not contend
+    with the log window or each other.
+
+    ..code-block:: python
+
+        logging.getLogger().addHandler(LogHandler())
+
+    :param buffer: The LogBuffer to store the records in. If not given the
+        OutputStream logs are used.
+    :type buffer: LogBuffer
+
+    :param level: The minimum level of records to handle
+    :type level: int
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, buffer=None, level=logging.NOTSET):
+        super(LogHandler, self).__init__(level=level)
+
+        self.buffer = buffer if buffer is not None else OutputStream.Logs
+
+        self._queue = queue.Queue()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+    # --------------------------------------------------------------------------
+    def emit(self, record):
+        # -- Start the thread on the first record rather than on creation
+        if not self._thread:
+            with self._thread_lock:
+                if not self._thread:
+                    self._thread = threading.Thread(
+                        target=self._process,
+                        name='LogHandler',
+                    )
+                    self._thread.daemon = True
+                    self._thread.start()
+
+        self._queue.put(record)
+
+    # --------------------------------------------------------------------------
+    def flush(self):
+        """
+        Blocks until all the records emitted so far have been stored
+        """
+        if self._thread:
+            self._queue.join()
+
+    # --------------------------------------------------------------------------
+    def close(self):
+        self.flush()
+        super(LogHandler, self).close()
+
+    # --------------------------------------------------------------------------
+    def _process(self):
+        """
+        Stores queued records in the buffer, for as long as the process
+        is running.
+        """
+        while True:
+            record = self._queue.get()
+
+            try:
+                self.buffer.append(
+                    self.format(record),
+                    timestamp=record.created,
+                    level=record.levelno,
+                    name=record.name,
+                    thread=record.threadName,
+                )
+
+            except Exception:
+                self.handleError(record)
+
+            finally:
+                self._queue.task_done()
 
 
 # ------------------------------------------------------------------------------
 # noinspection PyUnresolvedReferences,PyPep8Naming
 class TimedProcessorTray(Qt.QtWidgets.QSystemTrayIcon):
     """
-    This holds a timed processing system tray implementation
+    This holds a timed processing system tray implementation.
+
+    Each process call is scheduled individually. Unless given its own
+    interval when added, a process call is run every `interval` seconds.
+    A process call is never started whilst its previous run is still in
+    progress.
+
+    The following options can also be given as keyword arguments:
+
+        * max_workers, timeout and use_processes : See setConcurrency
+        * icon_paths : See setIconPaths
     """
+
+    # -- This is emitted (from whichever thread it finishes in) when a
+    # -- process call which timed out finally finishes
+    _timedOutCallFinished = Qt.QtCore.Signal(object)
+
     def __init__(self,
                  icon,
                  auto_process=False,
@@ -117,9 +504,18 @@ class TimedProcessorTray(Qt.QtWidgets.QSystemTrayIcon):
                  verbose=False,
                  *args,
                  **kwargs):
+
+        # -- These options are taken as keyword arguments only, so that
+        # -- any positional arguments continue to be passed to Qt
+        max_workers = kwargs.pop('max_workers', 1)
+        timeout = kwargs.pop('timeout', None)
+        use_processes = kwargs.pop('use_processes', False)
+        icon_paths = kwargs.pop('icon_paths', None)
+
         super(TimedProcessorTray, self).__init__(*args, **kwargs)
 
         self._log_window = None
+        self._statistics_window = None
 
         # -- Store any options we have been given about how we should
         # -- perform any processing
@@ -127,44 +523,59 @@ class TimedProcessorTray(Qt.QtWidgets.QSystemTrayIcon):
         self._process_on_timer = auto_process
         self._process_interval = float(interval)
 
-        # -- We will use this to hold a thread from
-        # -- which we will carry out our processing
+        # -- Store how the process calls should be executed
+        self._max_workers = max_workers
+        self._timeout = timeout
+        self._use_processes = use_processes
+
+        # -- This holds the pool the process calls are submitted to when
+        # -- processing concurrently. It is created on first use and is
+        # -- shared by every processing run
+        self._executor = None
+
+        # -- This holds the number of runs of each task which have been
+        # -- exported to each statistics file
+        self._exported_runs = dict()
+
+        # -- We will use this to hold the threads from which we are
+        # -- carrying out our processing, along with the most recent one
         self._process_thread = None
+        self._process_threads = list()
 
-        # -- Define a list of processes we need to call whenever
-        # -- we need to process
-        self._process_calls = list()
+        # -- Define a list of the scheduled tasks we need to call
+        # -- whenever we need to process
+        self._tasks = list()
 
         # -- Define a list of additional menu items which should
-        # -- be added to the menu
+        # -- be added to the menu, along with the locations to search
+        # -- for any of their icons given by name
         self._user_menu_actions = list()
+        self._icon_paths = icon_paths
 
         # -- Define our context menu. We will update this whenever
         # -- the user requests the menu
         self._menu = Qt.QtWidgets.QMenu()
+        self._buildMenu()
         self.setContextMenu(self._menu)
 
         # -- Set the icon of the tray item.
-        self.setIcon(Qt.QtGui.QIcon(icon))
+        self.setIcon(utilities.icons.icon(icon))
 
-        # -- Create the timer object which we will use
-        # -- to define when a processing run will occur
+        # -- Create the timer object which we will use to define when
+        # -- a processing run will occur. This is always set to trickle
+        # -- down when the next task becomes due
         self._timer = Qt.QtCore.QTimer()
-        self._timer.setInterval(self._process_interval * 1000)
-
-        # -- If we're set to auto scan, then start a scan
-        # -- immediately
-        if self._process_on_timer:
-            self._timer.start()
+        self._timer.setSingleShot(True)
 
         # -- Ensure that when the timer trickles down
-        # -- we begin a processing run
-        self._timer.timeout.connect(self.beginProcessing)
+        # -- we process any tasks which are due
+        self._timer.timeout.connect(self.processDueTasks)
 
         # -- Hook up signals and slots. We use this signal to generate
         # -- the menu on-demand. This way the data is always correct at
         # -- the point in time when the user requests it
         self.activated.connect(self.onActivate)
+        self._timedOutCallFinished.connect(self._onTimedOutCallFinished)
 
     # --------------------------------------------------------------------------
     def onActivate(self, reason):
@@ -183,10 +594,18 @@ class TimedProcessorTray(Qt.QtWidgets.QSystemTrayIcon):
 
         :return:
         """
+        self._releaseExecutor()
         sys.exit()
 
     # --------------------------------------------------------------------------
-    def addProcessCall(self, callable_item):
+    def addProcessCall(self,
+                       callable_item,
+                       interval=None,
+                       jitter=0,
+                       priority=0,
+                       backoff=2.0,
+                       max_interval=None,
+                       name=None):
         """
         Adds a callable item to the processor
 
@@ -194,23 +613,168 @@ class TimedProcessorTray(Qt.QtWidgets.QSystemTrayIcon):
             a functools.partial object
         :type callable_item: callable
 
-        :return: None
+        :param interval: The number of seconds between each call. If None
+            then the interval of the tray is used.
+        :type interval: float
+
+        :param jitter: Up to this many seconds are randomly added to each
+            interval, preventing tasks from always running at the same time
+        :type jitter: float
+
+        :param priority: Where several tasks are due at once, those with a
+            higher priority are started first
+        :type priority: int
+
+        :param backoff: Each consecutive failure multiplies the interval by
+            this amount
+        :type backoff: float
+
+        :param max_interval: The longest interval failures can back off to,
+            in seconds. If None, ScheduledTask.MAX_INTERVAL is used.
+        :type max_interval: float
+
+        :param name: The name to identify the task by in its statistics.
+            If not given this is taken from the callable.
+        :type name: str
+
+        :return: ScheduledTask
         """
-        self._process_calls.append(callable_item)
+        task = ScheduledTask(
+            callable_item,
+            interval=interval,
+            jitter=jitter,
+            priority=priority,
+            backoff=backoff,
+            max_interval=max_interval,
+            name=name,
+        )
+        self._tasks.append(task)
+        self._scheduleNext()
+
+        return task
 
     # --------------------------------------------------------------------------
     def removeProcessCall(self, callable_item):
         """
         Removes the callable item from the list of callable processes
 
-        :param callable_item: callable item. Highly recommended that this is
+        :param callable_item: callable item (or the ScheduledTask returned
+            when it was added). Highly recommended that this is
             a functools.partial object
         :type callable_item: callable
 
         :return: None
         """
-        if callable_item in self._process_calls:
-            self._process_calls.remove(callable_item)
+        for task in self._tasks:
+            if callable_item is task or callable_item == task.callable:
+                self._tasks.remove(task)
+                break
+
+    # --------------------------------------------------------------------------
+    def tasks(self):
+        """
+        Returns the scheduled tasks of this tray
+
+        :return: list(ScheduledTask, ...)
+        """
+        return list(self._tasks)
+
+    # --------------------------------------------------------------------------
+    def statistics(self):
+        """
+        Returns the statistics of every task, in the form of the task
+        statistics summary along with the name of the task.
+
+        :return: list(dict, ...)
+        """
+        results = list()
+
+        for task in self._tasks:
+            summary = task.statistics.summary()
+            summary['name'] = task.name
+
+            results.append(summary)
+
+        return results
+
+    # --------------------------------------------------------------------------
+    def exportStatistics(self, filepath, append=False):
+        """
+        Writes the run history of every task to the given file as json
+        lines, with one line per run. Each line holds the task name, the
+        time the run started, its wall and cpu time, whether it succeeded
+        and its error.
+
+        :param filepath: The file to write to
+        :type filepath: str
+
+        :param append: If True the runs are appended to the file rather than
+            replacing its contents. Only the runs which have not already been
+            exported to the file are written.
+        :type append: bool
+
+        :return: The number of runs written
+        """
+        count = 0
+
+        # -- Track how many runs of each task the file holds, so that
+        # -- appending does not write the same runs again
+        exported = self._exported_runs.setdefault(os.path.abspath(filepath), dict())
+
+        if not append:
+            exported.clear()
+
+        with open(filepath, 'a' if append else 'w') as f:
+            for task in self._tasks:
+                history = task.statistics.history()
+                unexported = task.statistics.runs - exported.get(task, 0)
+
+                exported[task] = task.statistics.runs
+
+                for run in history[-unexported:] if unexported > 0 else []:
+                    f.write(
+                        json.dumps(
+                            dict(
+                                task=task.name,
+                                started=run.started,
+                                wall_time=run.wall_time,
+                                cpu_time=run.cpu_time,
+                                succeeded=run.succeeded,
+                                error=run.error,
+                            ),
+                            sort_keys=True,
+                        ) + '\n',
+                    )
+                    count += 1
+
+        return count
+
+    # --------------------------------------------------------------------------
+    def profileNextRun(self, callable_item=None):
+        """
+        Profiles the next run of the given process call with cProfile. The
+        profile is logged and stored as the last_profile of the statistics
+        of the task.
+
+        :param callable_item: callable item (or the ScheduledTask returned
+            when it was added). If None then every task is profiled.
+        :type callable_item: callable
+
+        :return: None
+        """
+        for task in self._tasks:
+            if callable_item is None or callable_item is task or callable_item == task.callable:
+                task.profile_next = True
+
+    # --------------------------------------------------------------------------
+    def showStatistics(self):
+        """
+        Shows a window displaying the statistics of every task
+
+        :return: None
+        """
+        self._statistics_window = StatisticsWindow(self)
+        self._statistics_window.show()
 
     # --------------------------------------------------------------------------
     def addMenuItem(self, label, icon, action):
@@ -221,7 +785,8 @@ class TimedProcessorTray(Qt.QtWidgets.QSystemTrayIcon):
         :param label: Label to display the item with
         :type label: str
 
-        :param icon: Path to icon to be used
+        :param icon: Path to icon to be used, or the name of an icon within
+            the icon paths of the tray
         :type icon: str
 
         :param action: function callable which should be called when the
@@ -230,14 +795,15 @@ class TimedProcessorTray(Qt.QtWidgets.QSystemTrayIcon):
 
         :return: None
         """
-        self._user_menu_actions.append(
-            dict(
-                label=label,
-                icon=icon,
-                action=action,
-            ),
+        menu_data = dict(
+            label=label,
+            icon=icon,
+            action=action,
         )
 
+        self._user_menu_actions.append(menu_data)
+        self._addUserMenuAction(menu_data)
+
     # --------------------------------------------------------------------------
     def removeMenuItem(self, label):
         """
@@ -252,29 +818,103 @@ class TimedProcessorTray(Qt.QtWidgets.QSystemTrayIcon):
         for menu_data in self._user_menu_actions:
             if label == menu_data['label']:
                 self._user_menu_actions.remove(menu_data)
+
+                self._menu.removeAction(menu_data['menu_action'])
+                menu_data['menu_action'].deleteLater()
                 break
 
     # --------------------------------------------------------------------------
-    def beginProcessing(self):
+    def setIconPaths(self, icon_paths):
         """
-        This will trigger a processing run  providing there is not an
-        active processing run already in progress.
+        Sets the locations searched for any menu item icons which are given
+        by name rather than by path
+
+        :param icon_paths: single path, or list of paths to search
+        :type icon_paths: str or list(str, str)
+
+        :return: None
         """
-        if not self._process_thread:
+        self._icon_paths = icon_paths
 
-            if self.verbose:
-                self.showMessage(
-                    "Processing Tray",
-                    "About to process %s task(s)" % len(self._process_calls)
-                )
+        # -- Re-resolve the icons of the menu items
+        for menu_data in self._user_menu_actions:
+            icon = self._findIcon(menu_data['icon'])
+
+            menu_data['menu_action'].setIcon(
+                utilities.icons.icon(icon) if icon else Qt.QtGui.QIcon(),
+            )
+
+    # --------------------------------------------------------------------------
+    def setConcurrency(self, max_workers=1, timeout=None, use_processes=False):
+        """
+        Defines how the process calls are executed during a processing run.
+        By default they are called one after another.
+
+        This takes effect from the next processing run.
+
+        :param max_workers: The number of process calls which can be
+            executed at the same time
+        :type max_workers: int
 
-            # -- Create the new scan thread
-            self._process_thread = ProcessorThread(self._process_calls, self)
+        :param timeout: The number of seconds a process call may run for
+            before it is reported as timed out and no longer waited on. If
+            None then process calls are always waited on.
+        :type timeout: float
 
-            # -- Ensure it clears itself once its finished, and
-            # -- initiate its start.
-            self._process_thread.finished.connect(self.onEndOfProcessing)
-            self._process_thread.start()
+        :param use_processes: If True the process calls are executed in
+            separate processes rather than threads, which is better suited
+            to cpu bound process calls. Note that the process calls must
+            then be picklable (such as a functools.partial of a module
+            level function).
+        :type use_processes: bool
+
+        A process call which times out is reported as failed, but is not
+        run again until it has actually finished. Threads cannot be
+        interrupted, so a process call which never returns should be run
+        with use_processes, in which case the pool is terminated (failing
+        anything else running within it) and replaced.
+
+        :return: None
+        """
+        self._max_workers = max_workers
+        self._timeout = timeout
+        self._use_processes = use_processes
+
+        # -- Any calls already submitted are left to finish within the
+        # -- previous pool
+        self._releaseExecutor(terminate=False)
+
+    # --------------------------------------------------------------------------
+    def beginProcessing(self):
+        """
+        This will trigger a processing run of every task, other than those
+        which are still running from a previous processing run.
+        """
+        self._process(
+            [
+                task
+                for task in self._tasks
+                if not task.in_flight
+            ]
+        )
+
+    # --------------------------------------------------------------------------
+    def processDueTasks(self):
+        """
+        This will trigger a processing run of every task which is due and
+        is not still running from a previous processing run.
+        """
+        now = time.time()
+
+        self._process(
+            [
+                task
+                for task in self._tasks
+                if not task.in_flight and task.dueAt(self._process_interval) <= now
+            ]
+        )
+
+        self._scheduleNext()
 
     # --------------------------------------------------------------------------
     def onEndOfProcessing(self):
@@ -282,119 +922,314 @@ class TimedProcessorTray(Qt.QtWidgets.QSystemTrayIcon):
         This is called whenever a scan is complete. This performs any
         object clean up.
         """
-        self._process_thread = None
-
-    # --------------------------------------------------------------------------
-    def toggleVerbosity(self):
-        self.verbose = not self.verbose
+        self._process_thread = self._process_threads[-1] if self._process_threads else None
 
     # --------------------------------------------------------------------------
-    def generateMenu(self, styles=None):
+    def _process(self, tasks):
         """
-        This will update the contents of the menu to be reflective of the
-        users current settings.
+        Starts a processing run of the given tasks, in order of priority
         """
-        # -- Clear the current menu
-        self._menu.clear()
+        if not tasks:
+            return
 
-        # -- Add an item which is here to show the identifier as well
-        # -- as the scan status
-        action = Qt.QtWidgets.QAction(
-            'Processing' if self._process_thread else 'Idle',
-            self._menu,
+        tasks = sorted(tasks, key=lambda task: task.priority, reverse=True)
+
+        if self.verbose:
+            self.showMessage(
+                "Processing Tray",
+                "About to process %s task(s)" % len(tasks)
+            )
+
+        for task in tasks:
+            task.in_flight = True
+
+        # -- Create the new scan thread
+        process_thread = ProcessorThread(
+            [task.callable for task in tasks],
+            self,
+            executor=self._poolExecutor(),
+            max_workers=self._max_workers,
+            timeout=self._timeout,
+            use_processes=self._use_processes,
+            profile=[idx for idx, task in enumerate(tasks) if task.profile_next],
         )
-        self._menu.addAction(action)
 
-        # -- Add our seperator
-        self._menu.addSeparator()
-
-        # -- Add actions to enable/disable auto scan
-        tag = 'Disable' if self._process_on_timer else 'Enable'
-
-        action = Qt.QtWidgets.QAction(
-            '%s Auto Scan' % tag,
-            self._menu,
-        )
+        for task in tasks:
+            task.profile_next = False
 
-        # -- Connect the signal event
-        action.triggered.connect(
+        # -- Ensure it clears itself once its finished, and
+        # -- initiate its start.
+        process_thread.finished.connect(
             functools.partial(
-                self.set_auto_process,
-                not self._process_on_timer
+                self._onProcessorFinished,
+                process_thread,
+                tasks,
             )
         )
 
-        # -- Add the action
-        self._menu.addAction(action)
+        self._process_thread = process_thread
+        self._process_threads.append(process_thread)
 
-        # -- Add the time between scan item
-        action = Qt.QtWidgets.QAction(
-            'Set Interval (%s)' % self._process_interval,
-            self._menu
-        )
+        process_thread.start()
+        self._updateMenu()
+
+    # --------------------------------------------------------------------------
+    def _onProcessorFinished(self, process_thread, tasks):
+        """
+        Schedules the next run of each of the tasks processed by the given
+        thread, based on whether they succeeded
+        """
+        if process_thread in self._process_threads:
+            self._process_threads.remove(process_thread)
+
+        now = time.time()
+
+        for idx, task in enumerate(tasks):
+            task.complete(idx not in process_thread.failures, now)
+
+            if idx in process_thread.results:
+                task.statistics.record(process_thread.results[idx])
+
+            # -- A process call which timed out may still be running, so
+            # -- it remains in flight until it has actually finished
+            if idx in process_thread.timed_out:
+                process_thread.timed_out[idx].add_done_callback(
+                    functools.partial(self._notifyTimedOutCallFinished, task),
+                )
+
+            else:
+                task.in_flight = False
+
+        # -- A process which has timed out will never free up its worker,
+        # -- so the pool is terminated and a new one created for the
+        # -- next processing run
+        if process_thread.timed_out and process_thread.executor is self._executor:
+            if isinstance(self._executor, futures.ProcessPoolExecutor):
+                self._releaseExecutor(terminate=True)
+
+        self.onEndOfProcessing()
+        self._scheduleNext()
+        self._updateMenu()
+
+    # --------------------------------------------------------------------------
+    def _notifyTimedOutCallFinished(self, task, future):
+        """
+        Called from the pool once the process call of a task which timed
+        out has finished. As this is not called from the main thread we
+        pass the task on through a signal.
+        """
+        self._timedOutCallFinished.emit(task)
+
+    # --------------------------------------------------------------------------
+    def _onTimedOutCallFinished(self, task):
+        """
+        Allows a task which timed out to be run again now that its process
+        call has finished
+        """
+        task.in_flight = False
+
+        self._scheduleNext()
+        self._updateMenu()
+
+    # --------------------------------------------------------------------------
+    def _poolExecutor(self):
+        """
+        Returns the pool process calls are submitted to, creating it if
+        required. None is returned if process calls are to be called one
+        after another.
+        """
+        concurrent = self._max_workers > 1 or self._timeout or self._use_processes
+
+        if not concurrent or not futures:
+            return None
+
+        if not self._executor:
+            if self._use_processes:
+                self._executor = futures.ProcessPoolExecutor(max(self._max_workers or 1, 1))
+
+            else:
+                self._executor = futures.ThreadPoolExecutor(max(self._max_workers or 1, 1))
+
+        return self._executor
+
+    # --------------------------------------------------------------------------
+    def _releaseExecutor(self, terminate=True):
+        """
+        Stops using the current pool, terminating its processes if it is a
+        process pool and terminate is True
+        """
+        executor = self._executor
+        self._executor = None
+
+        if not executor:
+            return
+
+        if terminate and isinstance(executor, futures.ProcessPoolExecutor):
+            _terminatePool(executor)
+
+        else:
+            executor.shutdown(wait=False)
+
+    # --------------------------------------------------------------------------
+    def _scheduleNext(self):
+        """
+        Sets the timer to trickle down when the next task becomes due
+        """
+        self._timer.stop()
+
+        if not self._process_on_timer:
+            return
+
+        due_times = [
+            task.dueAt(self._process_interval)
+            for task in self._tasks
+            if not task.in_flight
+        ]
+
+        # -- If everything is running we will be re-scheduled as each
+        # -- task completes
+        if not due_times:
+            return
+
+        delay = max(min(due_times) - time.time(), 0)
+
+        # -- Qt timers cannot be set beyond around 24 days, so we cap the
+        # -- delay to a day and simply re-check then
+        self._timer.start(int(min(delay, 86400) * 1000))
+
+    # --------------------------------------------------------------------------
+    def toggleVerbosity(self):
+        self.verbose = not self.verbose
+        self._updateMenu()
+
+    # --------------------------------------------------------------------------
+    def toggleAutoProcess(self):
+        self.set_auto_process(not self._process_on_timer)
+
+    # --------------------------------------------------------------------------
+    def generateMenu(self, styles=None):
+        """
+        This will update the contents of the menu to be reflective of the
+        users current settings.
+
+        The menu actions are only created once, so this only updates the
+        text of any actions whose state has changed.
+        """
+        self._updateMenu()
+
+        # -- Only apply the styling if it differs from what the menu
+        # -- was last styled with
+        if styles and styles != self._menu_styles:
+            utilities.styling.apply(
+                styles=styles,
+                apply_to=self._menu,
+            )
+            self._menu_styles = styles
+
+    # --------------------------------------------------------------------------
+    def _buildMenu(self):
+        """
+        Creates all the actions of the menu. These are retained and updated
+        in place as the state of the tray changes.
+        """
+        self._menu_actions = dict()
+        self._menu_styles = None
+
+        # -- Add an item which is here to show the identifier as well
+        # -- as the scan status
+        self._menu_actions['status'] = self._menu.addAction('')
+
+        # -- Add our seperator
+        self._menu.addSeparator()
 
+        # -- Add actions to enable/disable auto scan
+        action = self._menu.addAction('')
+        action.triggered.connect(self.toggleAutoProcess)
+        self._menu_actions['auto_process'] = action
+
+        # -- Add the time between scan item
+        action = self._menu.addAction('')
         action.triggered.connect(
             functools.partial(
                 self.set_time_between_scan,
             )
         )
-
-        # -- Add the item
-        self._menu.addAction(action)
+        self._menu_actions['interval'] = action
 
         # -- Add our seperator
         self._menu.addSeparator()
 
-        action = Qt.QtWidgets.QAction(
-            'Trigger Processing',
-            self._menu,
-        )
+        action = self._menu.addAction('Trigger Processing')
         action.triggered.connect(self.beginProcessing)
-        self._menu.addAction(action)
-
-        if self.verbose:
-            action = Qt.QtWidgets.QAction(
-                'Disable verbose notifications',
-                self._menu,
-            )
-        else:
-            action = Qt.QtWidgets.QAction(
-                'Enable verbose notifications',
-                self._menu,
-            )
 
+        action = self._menu.addAction('')
         action.triggered.connect(self.toggleVerbosity)
-        self._menu.addAction(action)
+        self._menu_actions['verbose'] = action
 
-        # -- Add our seperator
+        action = self._menu.addAction('Statistics')
+        action.triggered.connect(self.showStatistics)
+
+        # -- Add our seperator. User assigned items are placed
+        # -- between this and the next seperator
         self._menu.addSeparator()
+        self._user_menu_end = self._menu.addSeparator()
+
+        # -- Add our exit option
+        action = self._menu.addAction('Exit')
+        action.triggered.connect(self.closeRequest)
 
-        # -- Add any user assigned items
         for menu_data in self._user_menu_actions:
-            action = Qt.QtWidgets.QAction(menu_data['label'], self._menu)
+            self._addUserMenuAction(menu_data)
 
-            if menu_data['icon']:
-                action.setIcon(Qt.QtGui.QIcon(menu_data['icon']))
+        self._updateMenu()
 
-            action.triggered.connect(menu_data['action'])
-            self._menu.addAction(action)
+    # --------------------------------------------------------------------------
+    def _updateMenu(self):
+        """
+        Updates the text of any menu actions which reflect the state of the
+        tray and have changed
+        """
+        texts = dict(
+            status='Processing' if self._process_thread else 'Idle',
+            auto_process='%s Auto Scan' % ('Disable' if self._process_on_timer else 'Enable'),
+            interval='Set Interval (%ss)' % self._process_interval,
+            verbose='%s verbose notifications' % ('Disable' if self.verbose else 'Enable'),
+        )
 
-        # -- Add our seperator
-        self._menu.addSeparator()
+        for key, text in texts.items():
+            action = self._menu_actions[key]
 
-        # -- Add our exit option
-        action = Qt.QtWidgets.QAction('Exit', self._menu)
-        action.triggered.connect(self.closeRequest)
-        self._menu.addAction(action)
+            if action.text() != text:
+                action.setText(text)
 
-        if styles:
-            utilities.styling.apply(
-                styles=['space'],
-                apply_to=self._menu,
-            )
+    # --------------------------------------------------------------------------
+    def _addUserMenuAction(self, menu_data):
+        """
+        Creates the menu action for the given user menu item, placing it
+        after the other user menu items
+        """
+        action = Qt.QtWidgets.QAction(menu_data['label'], self._menu)
 
-        # -- Regenerate the menu
-        self.setContextMenu(self._menu)
+        icon = self._findIcon(menu_data['icon'])
+
+        if icon:
+            action.setIcon(utilities.icons.icon(icon))
+
+        action.triggered.connect(menu_data['action'])
+
+        self._menu.insertAction(self._user_menu_end, action)
+        menu_data['menu_action'] = action
+
+    # --------------------------------------------------------------------------
+    def _findIcon(self, icon):
+        """
+        Returns the path of the given icon, which may be a path or the
+        name of an icon within our icon paths
+        """
+        if not icon or not self._icon_paths or os.path.isabs(icon):
+            return icon
+
+        return utilities.icons.find(icon, self._icon_paths) or icon
 
     # --------------------------------------------------------------------------
     def set_auto_process(self, value):
@@ -404,25 +1239,22 @@ class TimedProcessorTray(Qt.QtWidgets.QSystemTrayIcon):
         :param value: The value to switch to
         """
         self._process_on_timer = value
-
-        if self._process_on_timer:
-            self._timer.start()
-
-        else:
-            self._timer.stop()
+        self._scheduleNext()
+        self._updateMenu()
 
     # --------------------------------------------------------------------------
     def set_time_between_scan(self, value=None):
         """
         This allows the user to tailor how long to run between
-        scans
+        scans, in seconds. This applies to all the tasks which
+        were not given their own interval.
         """
         if value is None:
             value, ok = Qt.QtWidgets.QInputDialog.getInt(
                 None,
-                'Time (in minutes) between scans',
+                'Time (in seconds) between scans',
                 'This is minimum time between scans',
-                self._process_interval,
+                int(self._process_interval),
                 minValue=1,
                 maxValue=10000,
                 step=1,
@@ -431,14 +1263,11 @@ class TimedProcessorTray(Qt.QtWidgets.QSystemTrayIcon):
             if not ok:
                 return value
 
-        # -- Update our interval variable and apply it to the
-        # -- timer
-        self._process_interval = value
-        self._timer.stop()
-        self._timer.setInterval(self._process_interval * 1000)
-
-        if self._process_on_timer:
-            self._timer.start()
+        # -- Update our interval variable and re-schedule the
+        # -- timer accordingly
+        self._process_interval = float(value)
+        self._scheduleNext()
+        self._updateMenu()
 
         return value
 
@@ -492,26 +1321,640 @@ class ProcessorThread(Qt.QtCore.QThread):
     """
     All our scanning is handled in a thread to prevent the rest
     of the ui elements from being blocked.
+
+    By default the process calls are executed one after another. If given
+    an executor they are submitted to it instead. The thread finishes once
+    every process call has completed or timed out.
     """
 
+    # -- The number of seconds between checks for timed out process calls
+    POLL_INTERVAL = 0.1
+
     # --------------------------------------------------------------------------
-    def __init__(self, process_calls, tray):
+    def __init__(self,
+                 process_calls,
+                 tray,
+                 executor=None,
+                 max_workers=1,
+                 timeout=None,
+                 use_processes=False,
+                 profile=None):
         super(ProcessorThread, self).__init__()
-        self._process_calls = process_calls
+        self._process_calls = list(process_calls)
         self._tray = tray
 
+        # -- This is the pool to submit the process calls to, which is
+        # -- owned by the tray
+        self.executor = executor
+
+        self._max_workers = max(max_workers or 1, 1)
+        self._timeout = timeout
+        self._use_processes = use_processes
+
+        # -- This holds the index of each process call which should be
+        # -- profiled
+        self._profile = set(profile or [])
+
+        # -- This holds the index of every process call which failed or
+        # -- timed out
+        self.failures = set()
+
+        # -- This holds the TaskRun of each process call, by its index
+        self.results = dict()
+
+        # -- This holds the future of every process call which timed out,
+        # -- by its index, as they may still be running
+        self.timed_out = dict()
+
     # --------------------------------------------------------------------------
     def run(self):
-        for callable_process in self._process_calls:
+        if self.executor:
+            self._runPooled()
+            return
+
+        for idx, callable_process in enumerate(self._process_calls):
+            self._store(
+                idx,
+                _measuredCall(callable_process, idx in self._profile),
+            )
+
+    # --------------------------------------------------------------------------
+    def reportError(self, error, name=None):
+        """
+        Reports an error which occurred whilst processing. The error is
+        logged, and is also shown by the tray if it is verbose.
+
+        :param error: Description of the error, such as its traceback
+        :type error: str
+
+        :param name: The name of the process call which failed
+        :type name: str
+
+        :return: None
+        """
+        constants.log.error(
+            'Process call %s failed :\n%s',
+            name or '(unknown)',
+            error,
+        )
+
+        if self._tray.verbose:
+            self._tray.showMessage(
+                "Processing Tray",
+                error,
+            )
+
+    # --------------------------------------------------------------------------
+    def _store(self, idx, result):
+        """
+        Stores the TaskRun of the process call with the given index,
+        reporting it if it failed
+        """
+        self.results[idx] = result
+
+        if not result.succeeded:
+            self.failures.add(idx)
+            self.reportError(
+                result.error,
+                name=_callableName(self._process_calls[idx]),
+            )
+
+        if result.profile:
+            constants.log.info(
+                'Profile of %s :\n%s',
+                self._process_calls[idx],
+                result.profile,
+            )
+
+    # --------------------------------------------------------------------------
+    def _runPooled(self):
+        """
+        Submits all the process calls to the executor and waits for them to
+        complete. A process call only starts counting towards its timeout
+        once it has started running.
+        """
+        pending = dict()
+
+        for idx, callable_process in enumerate(self._process_calls):
             try:
-                callable_process()
+                future = self.executor.submit(
+                    _measuredCall,
+                    callable_process,
+                    idx in self._profile,
+                )
 
+            # -- The executor refuses new calls once it has been shut down
+            # -- or broken, such as when a process pool is terminated
             except (Exception, RuntimeError):
-                error = str(sys.exc_info())
-                print(error)
+                self._store(idx, _failedRun(traceback.format_exc().strip()))
+                continue
 
-                if self._tray.verbose:
-                    self._tray.showMessage(
-                        "Processing Tray",
-                        error,
-                    )
+            pending[future] = idx
+
+        started = dict()
+
+        while pending:
+            done, _ = futures.wait(
+                list(pending),
+                timeout=self.POLL_INTERVAL if self._timeout else None,
+                return_when=futures.FIRST_COMPLETED,
+            )
+
+            for future in done:
+                idx = pending.pop(future)
+
+                try:
+                    result = future.result()
+
+                # -- The process call itself cannot raise, but the pool
+                # -- can fail to run it
+                except (Exception, RuntimeError):
+                    result = _failedRun(traceback.format_exc().strip())
+
+                self._store(idx, result)
+
+            if not self._timeout:
+                continue
+
+            # -- Stop waiting on any process call which has been running
+            # -- for longer than it is allowed to
+            now = time.time()
+
+            for future in list(pending):
+                if not future.running():
+                    continue
+
+                if now - started.setdefault(future, now) < self._timeout:
+                    continue
+
+                idx = pending.pop(future)
+                self.timed_out[idx] = future
+
+                self._store(
+                    idx,
+                    TaskRun(
+                        started=started[future],
+                        wall_time=now - started[future],
+                        cpu_time=None,
+                        succeeded=False,
+                        error='%s timed out after %s seconds' % (
+                            self._process_calls[idx],
+                            self._timeout,
+                        ),
+                        profile=None,
+                    ),
+                )
+
+
+# ------------------------------------------------------------------------------
+class ScheduledTask(object):
+    """
+    Holds a process call of a TimedProcessorTray along with when it should
+    be called.
+
+    Each time the task fails, the time until it is next called is
+    multiplied by its backoff (up to its max_interval). Once it succeeds it
+    returns to its normal interval.
+
+    :param callable_item: The callable to process
+    :type callable_item: callable
+
+    :param interval: The number of seconds between each call. If None
+        then the interval of the tray is used.
+    :type interval: float
+
+    :param jitter: Up to this many seconds are randomly added to each
+        interval
+    :type jitter: float
+
+    :param priority: Tasks with a higher priority are started first
+    :type priority: int
+
+    :param backoff: The multiplier applied to the interval for each
+        consecutive failure
+    :type backoff: float
+
+    :param max_interval: The longest interval failures can back off to
+    :type max_interval: float
+
+    :param name: The name to identify the task by in its statistics. If
+        not given this is taken from the callable.
+    :type name: str
+    """
+
+    # -- The longest interval failures can back off to if a task is not
+    # -- given a max_interval. Tasks with a longer interval are unaffected.
+    MAX_INTERVAL = 3600
+
+    # --------------------------------------------------------------------------
+    def __init__(self,
+                 callable_item,
+                 interval=None,
+                 jitter=0,
+                 priority=0,
+                 backoff=2.0,
+                 max_interval=None,
+                 name=None):
+        self.callable = callable_item
+        self.name = name or _callableName(callable_item)
+        self.interval = interval
+        self.jitter = jitter
+        self.priority = priority
+        self.backoff = backoff
+        self.max_interval = max_interval
+
+        # -- The number of consecutive times this task has failed
+        self.failures = 0
+
+        # -- Whether this task is currently being processed
+        self.in_flight = False
+
+        # -- The timings and outcomes of the runs of this task, and
+        # -- whether the next run should be profiled
+        self.statistics = TaskStatistics()
+        self.profile_next = False
+
+        # -- When this task was last completed (or created) and the jitter
+        # -- to apply to its next interval
+        self._last_run = time.time()
+        self._jitter_offset = self._jitter()
+
+    # --------------------------------------------------------------------------
+    def delay(self, default_interval):
+        """
+        Returns the number of seconds between the last run of this task and
+        its next run, taking into account any failures
+
+        :param default_interval: The interval to use if this task does not
+            have its own interval
+        :type default_interval: float
+
+        :return: float
+        """
+        interval = self.interval if self.interval is not None else default_interval
+
+        if self.failures:
+            max_interval = max(self.max_interval or self.MAX_INTERVAL, interval)
+
+            # -- After enough failures the backoff is too large to be
+            # -- represented, by which point we are well past the maximum
+            try:
+                interval = min(
+                    interval * (float(self.backoff) ** self.failures),
+                    max_interval,
+                )
+
+            except OverflowError:
+                interval = max_interval
+
+        return interval + self._jitter_offset
+
+    # --------------------------------------------------------------------------
+    def dueAt(self, default_interval):
+        """
+        Returns the time (in seconds since the epoch) at which this task
+        is next due
+
+        :param default_interval: The interval to use if this task does not
+            have its own interval
+        :type default_interval: float
+
+        :return: float
+        """
+        return self._last_run + self.delay(default_interval)
+
+    # --------------------------------------------------------------------------
+    def complete(self, succeeded, now=None):
+        """
+        Records that a run of this task has completed, scheduling its
+        next run
+
+        :param succeeded: Whether the run succeeded
+        :type succeeded: bool
+
+        :param now: The time the run completed. If not given the current
+            time is used.
+        :type now: float
+
+        :return: None
+        """
+        self.failures = 0 if succeeded else self.failures + 1
+
+        self._last_run = now if now is not None else time.time()
+        self._jitter_offset = self._jitter()
+
+    # --------------------------------------------------------------------------
+    def _jitter(self):
+        return random.uniform(0, self.jitter) if self.jitter else 0
+
+
+# ------------------------------------------------------------------------------
+class TaskRun(collections.namedtuple('TaskRun', 'started wall_time cpu_time succeeded error profile')):
+    """
+    The outcome of a single run of a process call. Times are in seconds,
+    and the cpu time is None if it could not be measured (such as when
+    the run timed out). The profile holds the cProfile statistics of the
+    run as text, if it was profiled.
+    """
+    __slots__ = ()
+
+
+# ------------------------------------------------------------------------------
+class TaskStatistics(object):
+    """
+    Holds the counts and timings of the runs of a ScheduledTask, along with
+    a bounded history of its most recent runs.
+
+    :param history: The number of runs to hold in the history
+    :type history: int
+    """
+
+    # -- The default number of runs held in the history
+    HISTORY = 100
+
+    # --------------------------------------------------------------------------
+    def __init__(self, history=None):
+        self._history = collections.deque(maxlen=history or self.HISTORY)
+
+        self.runs = 0
+        self.successes = 0
+        self.failures = 0
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.last_error = None
+        self.last_profile = None
+
+    # --------------------------------------------------------------------------
+    def record(self, run):
+        """
+        Records the given run
+
+        :param run: The run to record
+        :type run: TaskRun
+
+        :return: None
+        """
+        self._history.append(run)
+
+        self.runs += 1
+        self.wall_time += run.wall_time
+        self.cpu_time += run.cpu_time or 0
+
+        if run.succeeded:
+            self.successes += 1
+
+        else:
+            self.failures += 1
+            self.last_error = run.error
+
+        if run.profile:
+            self.last_profile = run.profile
+
+    # --------------------------------------------------------------------------
+    def history(self):
+        """
+        Returns the most recent runs, oldest first
+
+        :return: list(TaskRun, ...)
+        """
+        return list(self._history)
+
+    # --------------------------------------------------------------------------
+    def summary(self):
+        """
+        Returns a dictionary describing the runs so far, containing the
+        following:
+
+            * runs : The number of runs
+            * successes : The number of runs which succeeded
+            * failures : The number of runs which failed or timed out
+            * mean_wall_time : The mean wall time of all runs
+            * mean_cpu_time : The mean cpu time of all runs
+            * recent_wall_time : The mean wall time of the runs in the history
+            * last_wall_time : The wall time of the most recent run
+            * last_error : The error of the most recent failure
+
+        :return: dict
+        """
+        recent = [run.wall_time for run in self._history]
+
+        return dict(
+            runs=self.runs,
+            successes=self.successes,
+            failures=self.failures,
+            mean_wall_time=self.wall_time / self.runs if self.runs else None,
+            mean_cpu_time=self.cpu_time / self.runs if self.runs else None,
+            recent_wall_time=sum(recent) / len(recent) if recent else None,
+            last_wall_time=recent[-1] if recent else None,
+            last_error=self.last_error,
+        )
+
+
+# ------------------------------------------------------------------------------
+# noinspection PyUnresolvedReferences
+class StatisticsWindow(Qt.QtWidgets.QMainWindow):
+    """
+    Displays the statistics of each task of a TimedProcessorTray, updating
+    whilst it is visible.
+    """
+
+    # -- The columns shown, along with the summary key they display
+    COLUMNS = [
+        ('Task', None),
+        ('Runs', 'runs'),
+        ('Failures', 'failures'),
+        ('Mean Wall (s)', 'mean_wall_time'),
+        ('Recent Wall (s)', 'recent_wall_time'),
+        ('Mean CPU (s)', 'mean_cpu_time'),
+        ('Last Error', 'last_error'),
+    ]
+
+    # --------------------------------------------------------------------------
+    def __init__(self, tray, parent=None):
+        super(StatisticsWindow, self).__init__(parent=parent)
+
+        self._tray = tray
+
+        # -- Define a title expressing what the window is
+        self.setWindowTitle('Statistics')
+
+        self.tree = Qt.QtWidgets.QTreeWidget()
+        self.tree.setRootIsDecorated(False)
+        self.tree.setHeaderLabels([label for label, _ in self.COLUMNS])
+        self.setCentralWidget(self.tree)
+
+        # -- Make it pretty and consistent with our styling
+        utilities.styling.apply(['space'], self)
+
+        self.refresh()
+
+        # -- Statistics are only updated as tasks complete, so we
+        # -- do not need to update the view often
+        self._timer = Qt.QtCore.QTimer(self)
+        self._timer.setSingleShot(False)
+        self._timer.setInterval(1000)
+        self._timer.timeout.connect(self.refresh)
+        self._timer.start()
+
+    # --------------------------------------------------------------------------
+    def refresh(self):
+        """
+        Updates the view with the current statistics
+
+        :return:
+        """
+        self.tree.clear()
+
+        for task in self._tray.tasks():
+            summary = task.statistics.summary()
+            values = list()
+
+            for _, key in self.COLUMNS:
+                value = summary.get(key) if key else task.name
+
+                if isinstance(value, float):
+                    value = '%.3f' % value
+
+                elif value is None:
+                    value = ''
+
+                # -- Only show the last line of any error
+                values.append(str(value).strip().split('\n')[-1])
+
+            self.tree.addTopLevelItem(Qt.QtWidgets.QTreeWidgetItem(values))
+
+    # --------------------------------------------------------------------------
+    def hideEvent(self, *args, **kwargs):
+        """
+        When the window is hidden, we do not need to update the view
+
+        :return:
+        """
+        self._timer.stop()
+
+    # --------------------------------------------------------------------------
+    def showEvent(self, *args, **kwargs):
+        """
+        When the window is shown we bring the view up to date and resume
+        updating it
+
+        :return:
+        """
+        self.refresh()
+        self._timer.start()
+
+
+# -- The most specific cpu clock available. time.thread_time only measures
+# -- the current thread, which matters when running process calls in threads
+_cpuTime = getattr(time, 'thread_time', None) or getattr(time, 'process_time', None) or time.clock
+
+
+# ------------------------------------------------------------------------------
+def _measuredCall(callable_item, profile=False):
+    """
+    Calls the given callable, measuring its wall and cpu time and
+    optionally profiling it. This never raises - any error is returned in
+    the TaskRun. This is at module level so it can be sent to a process pool.
+
+    :param callable_item: The callable to call
+    :type callable_item: callable
+
+    :param profile: Whether to profile the call with cProfile
+    :type profile: bool
+
+    :return: TaskRun
+    """
+    profiler = cProfile.Profile() if profile else None
+    profile_text = None
+    error = None
+
+    # -- Only one profiler can be active at a time from python 3.12, so if
+    # -- something else is already profiling we simply run the call
+    if profiler:
+        try:
+            profiler.enable()
+
+        except ValueError as exception:
+            constants.log.warning(
+                'Unable to profile %s : %s',
+                callable_item,
+                exception,
+            )
+            profiler = None
+
+    started = time.time()
+    cpu_started = _cpuTime()
+
+    try:
+        try:
+            callable_item()
+
+        finally:
+            if profiler:
+                profiler.disable()
+
+    except (Exception, RuntimeError):
+        error = traceback.format_exc().strip()
+
+    wall_time = time.time() - started
+    cpu_time = _cpuTime() - cpu_started
+
+    if profiler:
+        stream = StringIO()
+        stats = pstats.Stats(profiler, stream=stream)
+        stats.sort_stats('cumulative').print_stats(30)
+        profile_text = stream.getvalue()
+
+    return TaskRun(
+        started=started,
+        wall_time=wall_time,
+        cpu_time=cpu_time,
+        succeeded=error is None,
+        error=error,
+        profile=profile_text,
+    )
+
+
+# ------------------------------------------------------------------------------
+def _failedRun(error):
+    """
+    Returns the TaskRun of a process call which the pool failed to run
+    """
+    return TaskRun(
+        started=time.time(),
+        wall_time=0,
+        cpu_time=None,
+        succeeded=False,
+        error=error,
+        profile=None,
+    )
+
+
+# ------------------------------------------------------------------------------
+def _terminatePool(executor):
+    """
+    Terminates the processes of the given process pool, failing any process
+    calls running within it, and shuts it down
+    """
+    # -- Python 3.14 onwards can terminate the workers itself, otherwise we
+    # -- have to reach into the pool for its processes
+    if hasattr(executor, 'terminate_workers'):
+        executor.terminate_workers()
+        return
+
+    for process in list((getattr(executor, '_processes', None) or dict()).values()):
+        process.terminate()
+
+    executor.shutdown(wait=False)
+
+
+# ------------------------------------------------------------------------------
+def _callableName(callable_item):
+    """
+    Returns a readable name for the given callable, looking through any
+    functools.partial wrapping
+    """
+    while isinstance(callable_item, functools.partial):
+        callable_item = callable_item.func
+
+    return getattr(callable_item, '__name__', None) or str(callable_item)
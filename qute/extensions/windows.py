@@ -10,6 +10,10 @@ class MemorableWindow(Qt.QtWidgets.QMainWindow):
     # -- before we re-position it
     _SCREEN_BUFFER = 12
 
+    # -- How many milliseconds to wait after the last change in
+    # -- geometry before writing it to disk
+    _STORE_DELAY = 500
+
     # --------------------------------------------------------------------------
     def __init__(self, identifier=None, offsetX=7, offsetY=32, *args, **kwargs):
         super(MemorableWindow, self).__init__(*args, **kwargs)
@@ -17,6 +21,24 @@ class MemorableWindow(Qt.QtWidgets.QMainWindow):
         self._offsetX = offsetX
         self._offsetY = offsetY
 
+        # -- Geometry changes are held in memory and only written once
+        # -- the window has settled, as moving or resizing a window can
+        # -- trigger hundreds of changes a second
+        self._pending_geometry = None
+        self._stored_geometry = None
+
+        self._store_timer = Qt.QtCore.QTimer(self)
+        self._store_timer.setSingleShot(True)
+        self._store_timer.setInterval(self._STORE_DELAY)
+        self._store_timer.timeout.connect(self.flushSize)
+
+        # -- Ensure nothing is lost if the application quits before
+        # -- the timer has been triggered
+        q_app = Qt.QtWidgets.QApplication.instance()
+
+        if q_app:
+            q_app.aboutToQuit.connect(self.flushSize)
+
         # -- If we're given an id, set this object name
         if identifier:
             self.setObjectName(identifier)
@@ -41,6 +63,7 @@ class MemorableWindow(Qt.QtWidgets.QMainWindow):
         settings = Qt.QtCore.QSettings('quteSettings', self.objectName())
         settings.setValue('windowState', self.saveState())
         self.storeSize()
+        self.flushSize()
 
     def closeEvent(self, event):
         self.save()
@@ -96,15 +119,46 @@ class MemorableWindow(Qt.QtWidgets.QMainWindow):
 
     # --------------------------------------------------------------------------
     def storeSize(self):
-        stored_data = scribble.get(self.objectName())
-        stored_data['geometry'] = [
+        """
+        Records the current geometry of the window. This is held in memory
+        and written to disk once no further changes have been made for
+        _STORE_DELAY milliseconds, or when flushSize is called.
+
+        :return: None
+        """
+        self._pending_geometry = [
             self.pos().x() + self._offsetX,
             self.pos().y() + self._offsetY,
             self.width(),
             self.height(),
         ]
+
+        # -- Restarting the timer means we only write once the
+        # -- changes have stopped
+        self._store_timer.start()
+
+    # --------------------------------------------------------------------------
+    def flushSize(self):
+        """
+        Writes any recorded geometry to disk immediately, providing it differs
+        from what was last written.
+
+        :return: None
+        """
+        self._store_timer.stop()
+
+        geometry = self._pending_geometry
+        self._pending_geometry = None
+
+        if geometry is None or geometry == self._stored_geometry:
+            return
+
+        stored_data = scribble.get(self.objectName())
+        stored_data['geometry'] = geometry
         stored_data.save()
 
+        self._stored_geometry = geometry
+
     # --------------------------------------------------------------------------
     def resizeEvent(self, event):
         self.storeSize()
@@ -118,4 +172,5 @@ class MemorableWindow(Qt.QtWidgets.QMainWindow):
     # --------------------------------------------------------------------------
     def hideEvent(self, event):
         self.storeSize()
+        self.flushSize()
         super(MemorableWindow, self).hideEvent(event)
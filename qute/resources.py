@@ -14,6 +14,37 @@ def get(name):
     ).replace('\\', '/')
 
 
+# ------------------------------------------------------------------------------
+def pixmap(name, size=None):
+    """
+    Returns a cached pixmap of the resource with the given name
+
+    :param name: Filename of the resource
+    :type name: str
+
+    :param size: Optional size to scale the pixmap to
+    :type size: QSize or tuple(int, int)
+
+    :return: QPixmap
+    """
+    from .utilities import icons
+    return icons.pixmap(get(name), size=size)
+
+
+# ------------------------------------------------------------------------------
+def icon(name):
+    """
+    Returns a cached icon of the resource with the given name
+
+    :param name: Filename of the resource
+    :type name: str
+
+    :return: QIcon
+    """
+    from .utilities import icons
+    return icons.icon(get(name))
+
+
 # ------------------------------------------------------------------------------
 def all():
     files = list()
@@ -1,13 +1,38 @@
+import sys
+import importlib
+
 from ._core import *
 
-from . import derive
-from . import designer
-from . import events
-from . import layouts
-from . import menus
-from . import pixmaps
-from . import styling
-from . import widgets
-from . import windows
-from . import request
-from . import sizing
+# -- These are the submodules of utilities. They are imported the first
+# -- time they are accessed rather than up front
+_SUBMODULES = [
+    'derive',
+    'designer',
+    'events',
+    'layouts',
+    'menus',
+    'pixmaps',
+    'styling',
+    'widgets',
+    'windows',
+    'request',
+    'sizing',
+    'icons',
+]
+
+
+# ------------------------------------------------------------------------------
+def __getattr__(name):
+    if name not in _SUBMODULES:
+        raise AttributeError(
+            'module %s has no attribute %s' % (__name__, name),
+        )
+
+    return importlib.import_module('.' + name, __name__)
+
+
+# -- Module level __getattr__ is only supported from python 3.7, so on
+# -- earlier versions we have to import everything up front
+if sys.version_info < (3, 7):
+    for _name in _SUBMODULES:
+        __getattr__(_name)
@@ -0,0 +1,442 @@
+"""
+This module holds a shared cache of pixmaps and icons, so that the same
+image files are not repeatedly read and decoded from disk.
+
+Pixmaps are keyed by their path, the size they were requested at and the
+device pixel ratio. They are held up to a budget (in bytes), with the least
+recently used pixmaps being evicted first. Pixmaps are also shared through
+QPixmapCache, meaning any pixmap which has been evicted from our cache but
+is still within Qt's cache does not need decoding again.
+
+Icons can also be found by name within a list of directories through
+find. Each directory is indexed once, and only re-indexed when it changes.
+"""
+import os
+import re
+import time
+import collections
+
+from . import _core
+from ..vendor import Qt
+
+
+# -- This is the default number of bytes worth of pixmaps we will hold
+BUDGET = 32 * 1024 * 1024
+
+# -- This is the maximum number of icons we will hold
+ICON_LIMIT = 512
+
+# -- This holds our pixmaps and icons, ordered from the least recently
+# -- used to the most recently used
+_PIXMAPS = collections.OrderedDict()
+_ICONS = collections.OrderedDict()
+
+# -- These are the image extensions find will match, in order of preference
+EXTENSIONS = ['.png', '.svg', '.jpg', '.jpeg', '.ico', '.bmp', '.gif']
+
+# -- The minimum number of seconds between checking whether an indexed
+# -- directory has changed
+INDEX_CHECK_INTERVAL = 1.0
+
+# -- Matches the resolution suffix of an image name, such as foo@2x
+_SCALE_PATTERN = re.compile(r'^(.*)@(\d+(?:\.\d+)?)x$')
+
+# -- This holds the index of each directory searched by find, in the form
+# -- {directory: [mtime, last_checked, {name: {scale: path}}]}
+_INDEXES = dict()
+
+# -- This holds the state and counters of the pixmap cache and of the icon
+# -- cache, which are exposed through statistics
+_STATE = dict(
+    budget=BUDGET,
+    bytes=0,
+    hits=0,
+    shared_hits=0,
+    misses=0,
+    evictions=0,
+)
+
+_ICON_STATE = dict(
+    hits=0,
+    misses=0,
+    evictions=0,
+)
+
+
+# ------------------------------------------------------------------------------
+# noinspection PyUnresolvedReferences
+def pixmap(path, size=None, device_pixel_ratio=None):
+    """
+    Returns a pixmap of the image at the given path, reading it from disk
+    only if it is not already cached.
+
+    :param path: Absolute path to the image
+    :type path: str
+
+    :param size: Optional size (in device independent pixels) to scale the
+        pixmap to, retaining its aspect ratio
+    :type size: QSize or tuple(int, int)
+
+    :param device_pixel_ratio: The device pixel ratio the pixmap will be
+        displayed at. If this is not given the ratio of the application
+        is used.
+    :type device_pixel_ratio: float
+
+    :return: QPixmap
+    """
+    if size is not None and not isinstance(size, (tuple, list)):
+        size = (size.width(), size.height())
+
+    if device_pixel_ratio is None:
+        device_pixel_ratio = _applicationPixelRatio()
+
+    key = 'qute:%s:%s:%s' % (
+        path,
+        'x'.join(str(value) for value in size) if size else '',
+        device_pixel_ratio,
+    )
+
+    # -- Check our own cache first
+    if key in _PIXMAPS:
+        _STATE['hits'] += 1
+
+        result = _PIXMAPS.pop(key)
+        _PIXMAPS[key] = result
+
+        return result
+
+    # -- Check whether Qt still has it before reading it from disk
+    result = _findShared(key)
+
+    if result is not None:
+        _STATE['shared_hits'] += 1
+
+    else:
+        _STATE['misses'] += 1
+
+        result = Qt.QtGui.QPixmap(path)
+
+        if size and not result.isNull():
+            result = result.scaled(
+                int(size[0] * device_pixel_ratio),
+                int(size[1] * device_pixel_ratio),
+                Qt.QtCore.Qt.KeepAspectRatio,
+                Qt.QtCore.Qt.SmoothTransformation,
+            )
+
+            # -- We scaled to device pixels, so the pixmap needs to know
+            # -- its ratio to be drawn at the requested size
+            if device_pixel_ratio != 1:
+                result.setDevicePixelRatio(device_pixel_ratio)
+
+        Qt.QtGui.QPixmapCache.insert(key, result)
+
+    _PIXMAPS[key] = result
+    _STATE['bytes'] += _byteCount(result)
+
+    _evict()
+
+    return result
+
+
+# ------------------------------------------------------------------------------
+# noinspection PyUnresolvedReferences
+def icon(path):
+    """
+    Returns an icon of the image at the given path, creating it only if it is
+    not already cached.
+
+    Icons are cached separately from pixmaps and are not counted against
+    the pixmap budget. A QIcon created from a path does not decode the
+    image until it is drawn, and then only at the size it is drawn at
+    (picking up any @2x variant or rendering an svg at that size), so an
+    icon costs little more than its path until it is used.
+
+    :param path: Absolute path to the image
+    :type path: str
+
+    :return: QIcon
+    """
+    if path in _ICONS:
+        _ICON_STATE['hits'] += 1
+
+        result = _ICONS.pop(path)
+        _ICONS[path] = result
+
+        return result
+
+    _ICON_STATE['misses'] += 1
+
+    result = Qt.QtGui.QIcon(path)
+    _ICONS[path] = result
+
+    while len(_ICONS) > max(ICON_LIMIT, 0):
+        _ICONS.popitem(last=False)
+        _ICON_STATE['evictions'] += 1
+
+    return result
+
+
+# ------------------------------------------------------------------------------
+def setBudget(byte_count):
+    """
+    Sets the number of bytes worth of pixmaps which will be held, evicting
+    pixmaps if we are now over budget.
+
+    :param byte_count: Number of bytes
+    :type byte_count: int
+
+    :return: None
+    """
+    _STATE['budget'] = byte_count
+    _evict()
+
+
+# ------------------------------------------------------------------------------
+def budget():
+    """
+    Returns the number of bytes worth of pixmaps which will be held
+
+    :return: int
+    """
+    return _STATE['budget']
+
+
+# ------------------------------------------------------------------------------
+def statistics():
+    """
+    Returns a dictionary describing the current state of the caches. This
+    holds a 'pixmaps' dictionary describing the pixmap cache:
+
+        * budget : The number of bytes worth of pixmaps which will be held
+        * bytes : The number of bytes worth of pixmaps currently held
+        * count : The number of pixmaps currently held
+        * hits : Requests which were served from our cache
+        * shared_hits : Requests which were served from QPixmapCache
+        * misses : Requests which had to be read from disk
+        * evictions : Pixmaps evicted to stay within budget
+
+    And an 'icons' dictionary describing the icon cache:
+
+        * limit : The number of icons which will be held
+        * count : The number of icons currently held
+        * hits : Requests which were served from our cache
+        * misses : Requests which had to create a new icon
+        * evictions : Icons evicted to stay within the limit
+
+    :return: dict
+    """
+    pixmaps = dict(_STATE)
+    pixmaps['count'] = len(_PIXMAPS)
+
+    icons = dict(_ICON_STATE)
+    icons['limit'] = ICON_LIMIT
+    icons['count'] = len(_ICONS)
+
+    return dict(
+        pixmaps=pixmaps,
+        icons=icons,
+    )
+
+
+# ------------------------------------------------------------------------------
+def clear():
+    """
+    Removes all the pixmaps and icons from the cache and resets the
+    counters.
+
+    :return: None
+    """
+    _PIXMAPS.clear()
+    _ICONS.clear()
+
+    for counter in ['bytes', 'hits', 'shared_hits', 'misses', 'evictions']:
+        _STATE[counter] = 0
+
+    for counter in _ICON_STATE:
+        _ICON_STATE[counter] = 0
+
+
+# ------------------------------------------------------------------------------
+def find(name, locations):
+    """
+    Returns the path of the image with the given name (without extension)
+    within any of the given directories, or None if there is no such image.
+
+    Directories are searched in order, and within a directory extensions
+    are preferred in the order of EXTENSIONS. If the image only exists at
+    other resolutions (such as foo@2x.png) then the variant best suited to
+    the application is returned. Otherwise the standard resolution image
+    is returned, and Qt will pick up any resolution variants alongside it.
+
+    :param name: Name of the image to search for
+    :type name: str
+
+    :param locations: Single directory, or list of directories to search
+    :type locations: str or list(str, str)
+
+    :return: absolute image path or None
+    """
+    found = variants(name, locations)
+
+    if not found:
+        return None
+
+    if 1 in found:
+        return found[1]
+
+    # -- Take the smallest variant which is at least the pixel ratio
+    # -- of the application, or the largest if there is none
+    ratio = _applicationPixelRatio()
+    suitable = [scale for scale in found if scale >= ratio]
+
+    return found[min(suitable) if suitable else max(found)]
+
+
+# ------------------------------------------------------------------------------
+def variants(name, locations):
+    """
+    Returns all the resolutions of the image with the given name (without
+    extension) within the first of the given directories to contain it.
+
+    :param name: Name of the image to search for
+    :type name: str
+
+    :param locations: Single directory, or list of directories to search
+    :type locations: str or list(str, str)
+
+    :return: dict of {scale: path}, where a standard image has a scale of 1
+    """
+    for location in _core.toList(locations):
+        if not location:
+            continue
+
+        found = _directoryIndex(location).get(name)
+
+        if found:
+            return dict(found)
+
+    return dict()
+
+
+# ------------------------------------------------------------------------------
+def clearIndex():
+    """
+    Discards the indexes of all directories searched by find, forcing them
+    to be re-indexed
+
+    :return: None
+    """
+    _INDEXES.clear()
+
+
+# ------------------------------------------------------------------------------
+def _directoryIndex(directory):
+    """
+    Returns the index of images within the given directory, building or
+    re-building it if the directory has changed since it was indexed.
+    """
+    now = time.time()
+    cached = _INDEXES.get(directory)
+
+    if cached and now - cached[1] < INDEX_CHECK_INTERVAL:
+        return cached[2]
+
+    try:
+        mtime = os.stat(directory).st_mtime
+
+    except OSError:
+        mtime = None
+
+    if cached and cached[0] == mtime:
+        cached[1] = now
+        return cached[2]
+
+    index = dict()
+    ranks = dict()
+
+    for filename in os.listdir(directory) if mtime is not None else []:
+        stem, extension = os.path.splitext(filename)
+        extension = extension.lower()
+
+        if extension not in EXTENSIONS:
+            continue
+
+        scale = 1
+        match = _SCALE_PATTERN.match(stem)
+
+        if match:
+            stem = match.group(1)
+            scale = float(match.group(2))
+            scale = int(scale) if scale.is_integer() else scale
+
+        # -- Where the same image exists with several extensions we
+        # -- take the most preferred
+        rank = EXTENSIONS.index(extension)
+
+        if ranks.get((stem, scale), len(EXTENSIONS)) <= rank:
+            continue
+
+        ranks[(stem, scale)] = rank
+        index.setdefault(stem, dict())[scale] = os.path.join(directory, filename)
+
+    _INDEXES[directory] = [mtime, now, index]
+
+    return index
+
+
+# ------------------------------------------------------------------------------
+def _evict():
+    """
+    Removes the least recently used pixmaps until we are within budget
+    """
+    while _PIXMAPS and _STATE['bytes'] > _STATE['budget']:
+        _, evicted = _PIXMAPS.popitem(last=False)
+
+        _STATE['bytes'] -= _byteCount(evicted)
+        _STATE['evictions'] += 1
+
+
+# ------------------------------------------------------------------------------
+def _byteCount(pixmap_):
+    """
+    Returns the number of bytes the given pixmap occupies
+    """
+    return pixmap_.width() * pixmap_.height() * pixmap_.depth() // 8
+
+
+# ------------------------------------------------------------------------------
+# noinspection PyUnresolvedReferences
+def _findShared(key):
+    """
+    Returns the pixmap stored against the given key in the QPixmapCache, or
+    None if it is not there. The signature of find differs between bindings.
+    """
+    try:
+        result = Qt.QtGui.QPixmapCache.find(key)
+
+    except TypeError:
+        result = Qt.QtGui.QPixmap()
+
+        if not Qt.QtGui.QPixmapCache.find(key, result):
+            return None
+
+    if result is None or isinstance(result, bool) or result.isNull():
+        return None
+
+    return result
+
+
+# ------------------------------------------------------------------------------
+# noinspection PyUnresolvedReferences
+def _applicationPixelRatio():
+    """
+    Returns the device pixel ratio of the application, or 1 if there is no
+    application
+    """
+    q_app = Qt.QtWidgets.QApplication.instance()
+
+    if q_app and hasattr(q_app, 'devicePixelRatio'):
+        return q_app.devicePixelRatio()
+
+    return 1.0
@@ -1,12 +1,15 @@
-import os
-
-from . import _core
+from . import icons
+from ..vendor.Qt import QtCore
 from ..vendor.Qt import QtWidgets
-from ..vendor.Qt import QtGui
+
+
+# -- This is the object name given to the object which populates a lazy
+# -- menu, allowing it to be found from the menu
+_POPULATOR_NAME = '_qute_lazy_menu'
 
 
 # ------------------------------------------------------------------------------
-def menuFromDictionary(structure, parent=None, name=None, icon_paths=None, icon_map=None):
+def menuFromDictionary(structure, parent=None, name=None, icon_paths=None, icon_map=None, lazy=False):
     """
     This will generate a menu based on a dictionary structure, whereby
     the key is the label and the value is a function call. You can optionally
@@ -22,6 +25,10 @@ def menuFromDictionary(structure, parent=None, name=None, icon_paths=None, icon_
             * Dictionary : If a dictionary is found as a value then a sub
                 menu is created. You can have any number of nested dictionaries
 
+            * LazyMenu : A sub menu is created, which is only populated from
+                the LazyMenu when it is first shown. This allows a callable
+                returning a dictionary to be given.
+
             * None : If the value is None then a seperator will be added
                 regardless of the key.
     :type structure: dict
@@ -33,6 +40,12 @@ def menuFromDictionary(structure, parent=None, name=None, icon_paths=None, icon_
         name as the keys will be looked for in any of these locations. This
         can either be a single string location or a list of locations.
     :type icon_paths: str or [str, str]
+
+    :param lazy: If True, every sub menu is only populated when it is first
+        shown rather than the whole menu tree being built up front. Use
+        refreshMenu to re-populate a sub menu when its data changes.
+    :type lazy: bool
+
     :return:
     """
     if isinstance(parent, QtWidgets.QMenu):
@@ -49,25 +62,37 @@ def menuFromDictionary(structure, parent=None, name=None, icon_paths=None, icon_
             continue
 
         # -- Now check if we have a sub menu
-        if isinstance(target, dict):
+        if isinstance(target, (dict, LazyMenu)):
             sub_menu = QtWidgets.QMenu(label, menu)
 
             icon = _findIcon(label, icon_paths, icon_map)
 
             if icon:
                 sub_menu.setIcon(
-                    QtGui.QPixmap(
+                    icons.icon(
                         icon,
                     ),
                 )
 
-            menuFromDictionary(
-                structure=target,
-                parent=sub_menu,
-                name=label,
-                icon_paths=icon_paths,
-                icon_map=icon_map
-            )
+            # -- Lazy menus are populated when they are shown, everything
+            # -- else is populated immediately
+            if lazy or isinstance(target, LazyMenu):
+                _LazyMenuPopulator(
+                    sub_menu,
+                    target if isinstance(target, LazyMenu) else LazyMenu(target),
+                    icon_paths=icon_paths,
+                    icon_map=icon_map,
+                    lazy=lazy,
+                )
+
+            else:
+                menuFromDictionary(
+                    structure=target,
+                    parent=sub_menu,
+                    name=label,
+                    icon_paths=icon_paths,
+                    icon_map=icon_map
+                )
 
             menu.addMenu(
                 sub_menu,
@@ -83,7 +108,7 @@ def menuFromDictionary(structure, parent=None, name=None, icon_paths=None, icon_
             if icon:
                 # -- Create the menu action
                 action = QtWidgets.QAction(
-                    QtGui.QIcon(icon),
+                    icons.icon(icon),
                     label,
                     menu,
                 )
@@ -108,11 +133,155 @@ def menuFromDictionary(structure, parent=None, name=None, icon_paths=None, icon_
     return menu
 
 
+# ------------------------------------------------------------------------------
+def refreshMenu(menu, source=None):
+    """
+    Re-populates a lazily populated menu, such as when the data it was
+    generated from has changed. If the menu is visible it is re-populated
+    immediately, otherwise it is re-populated when it is next shown.
+
+    :param menu: A sub menu generated by menuFromDictionary from a
+        LazyMenu, or with lazy set to True
+    :type menu: QMenu
+
+    :param source: Optionally, a new dictionary or callable returning a
+        dictionary to populate the menu from
+    :type source: dict or callable
+
+    :return: True if the menu is lazily populated and was refreshed
+    """
+    # -- Only look at the menu itself, as a submenu could hold a
+    # -- populator of its own
+    populator = menu.findChild(
+        QtCore.QObject,
+        _POPULATOR_NAME,
+        QtCore.Qt.FindDirectChildrenOnly,
+    )
+
+    if not populator:
+        return False
+
+    if source is not None:
+        populator.source.source = source
+
+    populator.reset()
+    return True
+
+
+# ------------------------------------------------------------------------------
+class LazyMenu(object):
+    """
+    Defines a sub menu within the dictionary given to menuFromDictionary
+    which is only populated when it is first shown.
+
+    :param source: Dictionary, or callable returning a dictionary, to
+        populate the menu from. This follows the same form as the
+        dictionary given to menuFromDictionary.
+    :type source: dict or callable
+
+    :param cache: If True the menu is only populated the first time it is
+        shown (until it is refreshed). Otherwise it is re-populated every
+        time it is shown.
+    :type cache: bool
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, source, cache=True):
+        self.source = source
+        self.cache = cache
+
+    # --------------------------------------------------------------------------
+    def structure(self):
+        """
+        Returns the dictionary to populate the menu from
+
+        :return: dict
+        """
+        if callable(self.source):
+            return self.source() or dict()
+
+        return self.source
+
+
+# ------------------------------------------------------------------------------
+# noinspection PyUnresolvedReferences
+class _LazyMenuPopulator(QtCore.QObject):
+    """
+    Populates the menu it is parented to from a LazyMenu when the menu is
+    about to be shown. Being parented to the menu ties its lifetime to the
+    menu.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, menu, source, icon_paths=None, icon_map=None, lazy=False):
+        super(_LazyMenuPopulator, self).__init__(menu)
+        self.setObjectName(_POPULATOR_NAME)
+
+        self.menu = menu
+        self.source = source
+        self.populated = False
+
+        self._icon_paths = icon_paths
+        self._icon_map = icon_map
+        self._lazy = lazy
+
+        menu.aboutToShow.connect(self.populate)
+
+    # --------------------------------------------------------------------------
+    def populate(self):
+        """
+        Populates the menu, if it has not already been populated
+        """
+        if self.populated and self.source.cache:
+            return
+
+        self._clear()
+
+        menuFromDictionary(
+            structure=self.source.structure(),
+            parent=self.menu,
+            icon_paths=self._icon_paths,
+            icon_map=self._icon_map,
+            lazy=self._lazy,
+        )
+
+        self.populated = True
+
+    # --------------------------------------------------------------------------
+    def reset(self):
+        """
+        Marks the menu as needing to be populated, re-populating it
+        immediately if it is visible
+        """
+        self.populated = False
+
+        if self.menu.isVisible():
+            self.populate()
+
+        else:
+            self._clear()
+
+    # --------------------------------------------------------------------------
+    def _clear(self):
+        """
+        Removes everything from the menu. Clearing a menu does not delete
+        its sub menus, so we delete those we created
+        """
+        for action in self.menu.actions():
+            sub_menu = action.menu()
+
+            if sub_menu and sub_menu.parent() == self.menu:
+                sub_menu.deleteLater()
+
+        self.menu.clear()
+
+
 # ------------------------------------------------------------------------------
 def _findIcon(label, icon_paths, icon_map=None):
     """
-    Private function for finding png icons with the label name
-    from any of the given icon paths
+    Private function for finding icons with the label name
+    from any of the given icon paths. See icons.find for the
+    extensions and resolutions which are matched.
 
     :param label: Name of the icon to search for
     :type label: str
@@ -125,19 +294,4 @@ def _findIcon(label, icon_paths, icon_map=None):
     if icon_map and label in icon_map:
         return icon_map[label]
 
-    # -- Ensure we're working with a list
-    icon_paths = _core.toList(icon_paths)
-
-    for icon_path in icon_paths:
-
-        if not icon_path:
-            continue
-
-        for filename in os.listdir(icon_path):
-            if filename[:-4] == label:
-                return os.path.join(
-                    icon_path,
-                    filename,
-                )
-
-    return None
+    return icons.find(label, icon_paths)
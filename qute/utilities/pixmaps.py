@@ -1,8 +1,19 @@
+import sys
+import collections
+
 from ..vendor.Qt.QtGui import QPixmap, QImage
 from ..vendor.Qt.QtCore import QByteArray, QDataStream, QIODevice
 
 from ..vendor import Qt
 
+# -- numpy is optional, but when it is available we use it to
+# -- process pixel data in bulk
+try:
+    import numpy
+
+except ImportError:
+    numpy = None
+
 
 # --------------------------------------------------------------------------
 def toGrayscale(pixmap):
@@ -17,6 +28,69 @@ def toGrayscale(pixmap):
     # -- Get an image object
     image = pixmap.toImage()
 
+    # -- Return the pixmap
+    return Qt.QtGui.QPixmap.fromImage(
+        _toGrayscaleImage(image),
+    )
+
+
+# --------------------------------------------------------------------------
+def _toGrayscaleImage(image):
+    """
+    Returns a grayscale version of the given image, retaining its alpha
+    channel.
+
+    The gray value of each pixel is calculated from its stored value in the
+    same way as qGray. When numpy is available this is done in bulk on the
+    raw pixel data. Otherwise Qt's own grayscale conversion is used if it
+    gives the same result (Qt6 weights the channels differently), then
+    the raw pixel data is processed as bytes, and only images in any other
+    format are processed one pixel at a time.
+
+    :param image: QImage
+
+    :return: QImage
+    """
+    # -- The bulk methods can only take the formats which would be
+    # -- treated as 32 bit colours by setPixel
+    bulk_formats = [
+        QImage.Format_RGB32,
+        QImage.Format_ARGB32,
+        QImage.Format_ARGB32_Premultiplied,
+    ]
+
+    if image.format() not in bulk_formats:
+        gray_image = _toGrayscaleImagePerPixel(image)
+
+    elif numpy is not None:
+        gray_image = _toGrayscaleImageNumpy(image)
+
+    elif _grayscale8MatchesQGray():
+        gray_image = _toGrayscaleImageGrayscale8(image)
+
+    else:
+        gray_image = _toGrayscaleImageBytes(image)
+
+    # -- Re-apply the alpha channel
+    gray_image.setAlphaChannel(
+        _alphaChannel(image),
+    )
+
+    return gray_image
+
+
+# --------------------------------------------------------------------------
+def _toGrayscaleImagePerPixel(image):
+    """
+    Returns an opaque grayscale copy of the given image, processing each
+    pixel individually.
+
+    :param image: QImage
+
+    :return: QImage
+    """
+    image = image.copy()
+
     # -- Cycle the pixels and convert them to grayscale
     for x in range(image.width()):
         for y in range(image.height()):
@@ -40,10 +114,677 @@ def toGrayscale(pixmap):
                 ).rgb()
             )
 
-    # -- Re-apply the alpha channel
-    image.setAlphaChannel(
-        pixmap.toImage().alphaChannel()
+    return image
+
+
+# --------------------------------------------------------------------------
+def _toGrayscaleImageNumpy(image):
+    """
+    Returns an opaque grayscale copy of the given 32 bit image, processing
+    all the pixels at once using numpy.
+
+    :param image: QImage
+
+    :return: QImage
+    """
+    # -- These are the stored (and so possibly premultiplied) 0xAARRGGBB
+    # -- values, which is what image.pixel gives us
+    pixels = _pixelArray(image)
+
+    red = (pixels >> 16) & 0xff
+    green = (pixels >> 8) & 0xff
+    blue = pixels & 0xff
+
+    # -- This is the same calculation as qGray
+    gray = (red * 11 + green * 16 + blue * 5) // 32
+
+    gray_pixels = numpy.ascontiguousarray(
+        0xff000000 | (gray << 16) | (gray << 8) | gray,
+        dtype=numpy.uint32,
     )
 
-    # -- Return the pixmap
-    return Qt.QtGui.QPixmap.fromImage(image)
+    # -- Opaque pixels are stored the same way whether or not the format
+    # -- is premultiplied, so the data suits the format of the image
+    return _imageFromData(
+        gray_pixels.tobytes(),
+        image.width(),
+        image.height(),
+        image.format(),
+    )
+
+
+# --------------------------------------------------------------------------
+def _toGrayscaleImageGrayscale8(image):
+    """
+    Returns an opaque grayscale copy of the given 32 bit image using Qt's
+    own grayscale conversion. This must only be used when
+    _grayscale8MatchesQGray is True.
+
+    :param image: QImage
+
+    :return: QImage
+    """
+    # -- Read the stored values as opaque colours, so that premultiplied
+    # -- pixels are converted as they are stored (as image.pixel gives
+    # -- them) rather than being un-premultiplied first
+    opaque = _imageFromData(
+        _pixelBytes(image),
+        image.width(),
+        image.height(),
+        QImage.Format_RGB32,
+    )
+
+    return opaque.convertToFormat(
+        QImage.Format_Grayscale8,
+    ).convertToFormat(
+        image.format(),
+    )
+
+
+# --------------------------------------------------------------------------
+def _toGrayscaleImageBytes(image):
+    """
+    Returns an opaque grayscale copy of the given 32 bit image, processing
+    the raw pixel data as bytes. This is slower than numpy, but does not
+    need to call into Qt for every pixel.
+
+    :param image: QImage
+
+    :return: QImage
+    """
+    data = _pixelBytes(image)
+
+    # -- Each pixel is a native 0xAARRGGBB integer, so the order of the
+    # -- channel bytes depends on the byte order
+    if sys.byteorder == 'little':
+        blue, green, red = data[0::4], data[1::4], data[2::4]
+
+    else:
+        red, green, blue = data[1::4], data[2::4], data[3::4]
+
+    # -- This is the same calculation as qGray
+    gray = bytearray(
+        (_RED_WEIGHTS[r] + _GREEN_WEIGHTS[g] + _BLUE_WEIGHTS[b]) >> 5
+        for r, g, b in zip(red, green, blue)
+    )
+
+    # -- Write every channel of every pixel, with an opaque alpha
+    gray_data = bytearray(b'\xff' * len(data))
+
+    for offset in ((0, 1, 2) if sys.byteorder == 'little' else (1, 2, 3)):
+        gray_data[offset::4] = gray
+
+    return _imageFromData(
+        bytes(gray_data),
+        image.width(),
+        image.height(),
+        image.format(),
+    )
+
+
+# -- The weights qGray gives to each channel, looked up by channel value
+_RED_WEIGHTS = [value * 11 for value in range(256)]
+_GREEN_WEIGHTS = [value * 16 for value in range(256)]
+_BLUE_WEIGHTS = [value * 5 for value in range(256)]
+
+
+# --------------------------------------------------------------------------
+def _grayscale8MatchesQGray():
+    """
+    Returns True if converting an image to Format_Grayscale8 gives the
+    same values as qGray. This is the case with Qt5, whereas Qt6 uses a
+    different weighting of the channels. The answer is worked out once.
+
+    :return: bool
+    """
+    global _GRAYSCALE8_MATCHES_QGRAY
+
+    if _GRAYSCALE8_MATCHES_QGRAY is None:
+        _GRAYSCALE8_MATCHES_QGRAY = False
+
+        if hasattr(QImage, 'Format_Grayscale8'):
+            probe = QImage(len(_GRAYSCALE8_PROBES), 1, QImage.Format_RGB32)
+
+            for x, rgb in enumerate(_GRAYSCALE8_PROBES):
+                probe.setPixel(x, 0, rgb)
+
+            converted = probe.convertToFormat(QImage.Format_Grayscale8)
+
+            _GRAYSCALE8_MATCHES_QGRAY = all(
+                Qt.QtGui.qGray(converted.pixel(x, 0)) == Qt.QtGui.qGray(rgb)
+                for x, rgb in enumerate(_GRAYSCALE8_PROBES)
+            )
+
+    return _GRAYSCALE8_MATCHES_QGRAY
+
+
+# -- Whether Format_Grayscale8 can be used, which is only known once
+# -- the first image has been converted
+_GRAYSCALE8_MATCHES_QGRAY = None
+
+# -- Colours which show up a difference in the weighting of the channels
+_GRAYSCALE8_PROBES = [
+    0xffff0000,
+    0xff00ff00,
+    0xff0000ff,
+    0xff643219,
+    0xff19c87d,
+    0xffd2b48c,
+    0xff808080,
+]
+
+
+# --------------------------------------------------------------------------
+def _imageFromData(data, width, height, image_format):
+    """
+    Returns an image of the given 32 bit format holding a copy of the
+    given packed pixel data.
+
+    :param data: bytes
+    :param width: int
+    :param height: int
+    :param image_format: QImage.Format
+
+    :return: QImage
+    """
+    # -- The image does not own the data it is given, so we take a copy
+    # -- before the data goes out of scope
+    return QImage(
+        data,
+        width,
+        height,
+        width * 4,
+        image_format,
+    ).copy()
+
+
+# --------------------------------------------------------------------------
+def _pixelBytes(image):
+    """
+    Returns the pixel data of the given 32 bit image as bytes, with four
+    bytes per pixel and no padding at the end of each line.
+
+    :param image: QImage
+
+    :return: bytes
+    """
+    bits = image.constBits()
+    byte_count = image.bytesPerLine() * image.height()
+
+    # -- PyQt gives us a pointer which needs to be told how much
+    # -- data it points to
+    if hasattr(bits, 'setsize'):
+        bits.setsize(byte_count)
+
+    data = bytes(memoryview(bits)[:byte_count])
+    line_length = image.width() * 4
+
+    if image.bytesPerLine() == line_length:
+        return data
+
+    # -- Lines may be padded, so we only take the width we need
+    return b''.join(
+        data[offset:offset + line_length]
+        for offset in range(0, byte_count, image.bytesPerLine())
+    )
+
+
+# --------------------------------------------------------------------------
+def _pixelArray(image):
+    """
+    Returns a numpy array of shape (height, width) holding a copy of the
+    pixel data of the given 32 bit image.
+
+    :param image: QImage
+
+    :return: numpy.ndarray
+    """
+    return numpy.frombuffer(
+        _pixelBytes(image),
+        dtype=numpy.uint32,
+    ).reshape(
+        image.height(),
+        image.width(),
+    ).astype(numpy.uint32)
+
+
+# --------------------------------------------------------------------------
+def _alphaChannel(image):
+    """
+    Returns the alpha channel of the given image in a form which can be
+    given to setAlphaChannel.
+
+    :param image: QImage
+
+    :return: QImage
+    """
+    # -- alphaChannel was removed in Qt6, where Alpha8 is used instead
+    if hasattr(image, 'alphaChannel'):
+        return image.alphaChannel()
+
+    return image.convertToFormat(QImage.Format_Alpha8)
+
+
+# ------------------------------------------------------------------------------
+class ImageFilter(object):
+    """
+    An ImageFilter is a single operation which takes a QImage and returns a
+    new QImage. Filters are combined into a FilterChain and can be run from
+    any thread, so they must only use QImage (and not QPixmap).
+
+    The arguments given to a filter are used to identify it, so they must be
+    hashable.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, *args):
+        self.arguments = args
+
+    # --------------------------------------------------------------------------
+    def key(self):
+        """
+        Returns a hashable key which uniquely identifies this filter and the
+        arguments it was given
+
+        :return: tuple
+        """
+        return (self.__class__.__name__,) + self.arguments
+
+    # --------------------------------------------------------------------------
+    def apply(self, image):
+        """
+        This should be re-implemented to return a filtered version of the
+        given image
+
+        :param image: QImage
+
+        :return: QImage
+        """
+        return image
+
+
+# ------------------------------------------------------------------------------
+class GrayscaleFilter(ImageFilter):
+    """
+    Converts the image to grayscale, retaining its alpha channel
+    """
+
+    # --------------------------------------------------------------------------
+    def apply(self, image):
+        return _toGrayscaleImage(
+            image.convertToFormat(QImage.Format_ARGB32_Premultiplied),
+        )
+
+
+# ------------------------------------------------------------------------------
+# noinspection PyUnresolvedReferences
+class TintFilter(ImageFilter):
+    """
+    Tints the image with the given colour, only affecting the visible
+    pixels of the image.
+
+    :param color: The colour to tint with as an (r, g, b) or (r, g, b, a)
+        tuple
+    :type color: tuple
+
+    :param strength: How strongly to tint the image, between 0 and 1
+    :type strength: float
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, color, strength=1.0):
+        super(TintFilter, self).__init__(tuple(color), strength)
+
+    # --------------------------------------------------------------------------
+    def apply(self, image):
+        color, strength = self.arguments
+
+        image = image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+
+        painter = Qt.QtGui.QPainter(image)
+        painter.setCompositionMode(
+            Qt.QtGui.QPainter.CompositionMode_SourceAtop,
+        )
+        painter.setOpacity(strength)
+        painter.fillRect(image.rect(), Qt.QtGui.QColor(*color))
+        painter.end()
+
+        return image
+
+
+# ------------------------------------------------------------------------------
+# noinspection PyUnresolvedReferences
+class DisabledFilter(ImageFilter):
+    """
+    Produces the disabled state of an image, by converting it to grayscale
+    and reducing its opacity.
+
+    :param opacity: The opacity of the resulting image, between 0 and 1
+    :type opacity: float
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, opacity=0.5):
+        super(DisabledFilter, self).__init__(opacity)
+
+    # --------------------------------------------------------------------------
+    def apply(self, image):
+        gray_image = GrayscaleFilter().apply(image)
+
+        image = QImage(gray_image.size(), QImage.Format_ARGB32_Premultiplied)
+        image.fill(0)
+
+        painter = Qt.QtGui.QPainter(image)
+        painter.setOpacity(self.arguments[0])
+        painter.drawImage(0, 0, gray_image)
+        painter.end()
+
+        return image
+
+
+# ------------------------------------------------------------------------------
+# noinspection PyUnresolvedReferences
+class ScaleFilter(ImageFilter):
+    """
+    Scales the image to fit the given size, such as when generating
+    thumbnails.
+
+    :param width: The width to scale to
+    :type width: int
+
+    :param height: The height to scale to
+    :type height: int
+
+    :param keep_aspect: If True the aspect ratio of the image is retained,
+        meaning the result fits within the given size
+    :type keep_aspect: bool
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, width, height, keep_aspect=True):
+        super(ScaleFilter, self).__init__(width, height, keep_aspect)
+
+    # --------------------------------------------------------------------------
+    def apply(self, image):
+        width, height, keep_aspect = self.arguments
+
+        return image.scaled(
+            width,
+            height,
+            Qt.QtCore.Qt.KeepAspectRatio if keep_aspect else Qt.QtCore.Qt.IgnoreAspectRatio,
+            Qt.QtCore.Qt.SmoothTransformation,
+        )
+
+
+# ------------------------------------------------------------------------------
+# noinspection PyUnresolvedReferences
+class CompositeFilter(ImageFilter):
+    """
+    Draws another image (such as a badge or overlay) over the image.
+
+    :param overlay: Absolute path to the image to draw over the image
+    :type overlay: str
+
+    :param x: The horizontal position to draw the overlay at
+    :type x: int
+
+    :param y: The vertical position to draw the overlay at
+    :type y: int
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, overlay, x=0, y=0):
+        super(CompositeFilter, self).__init__(overlay, x, y)
+
+    # --------------------------------------------------------------------------
+    def apply(self, image):
+        overlay, x, y = self.arguments
+
+        image = image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+
+        painter = Qt.QtGui.QPainter(image)
+        painter.drawImage(x, y, QImage(overlay))
+        painter.end()
+
+        return image
+
+
+# ------------------------------------------------------------------------------
+class FilterChain(object):
+    """
+    A FilterChain is an ordered list of ImageFilters which are applied one
+    after the other.
+
+    .. code-block:: python
+
+        >>> chain = FilterChain(
+        ...     ScaleFilter(64, 64),
+        ...     TintFilter((255, 150, 0), strength=0.4),
+        ... )
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, *filters):
+        self.filters = list(filters)
+
+    # --------------------------------------------------------------------------
+    def key(self):
+        """
+        Returns a hashable key which uniquely identifies this chain
+
+        :return: tuple
+        """
+        return tuple(
+            image_filter.key()
+            for image_filter in self.filters
+        )
+
+    # --------------------------------------------------------------------------
+    def apply(self, image):
+        """
+        Applies all the filters in this chain to the given image
+
+        :param image: QImage
+
+        :return: QImage
+        """
+        for image_filter in self.filters:
+            image = image_filter.apply(image)
+
+        return image
+
+
+# ------------------------------------------------------------------------------
+# noinspection PyUnresolvedReferences,PyPep8Naming
+class ImageProcessor(Qt.QtCore.QObject):
+    """
+    The ImageProcessor runs FilterChains over image files using a thread
+    pool, so that generating many variants of many images never blocks the
+    event loop. Finished pixmaps are delivered through the pixmapReady signal
+    and are remembered, so requesting the same image and chain again returns
+    the pixmap immediately.
+
+    .. code-block:: python
+
+        >>> processor = ImageProcessor()
+        >>> processor.pixmapReady.connect(on_pixmap_ready)
+        >>>
+        >>> chain = FilterChain(ScaleFilter(64, 64), DisabledFilter())
+        >>> for path in paths:
+        ...     pixmap = processor.request(path, chain)
+
+    :param cache_limit: The maximum number of pixmaps to remember
+    :type cache_limit: int
+
+    :param thread_pool: The thread pool to run the filters within. If this
+        is not given the global thread pool is used.
+    :type thread_pool: QThreadPool
+    """
+
+    # -- Emitted with the request key and the finished pixmap. The pixmap
+    # -- is null if the image could not be read or processed
+    pixmapReady = Qt.QtCore.Signal(str, object)
+
+    # -- Used internally to pass finished images back from the
+    # -- thread pool
+    _imageReady = Qt.QtCore.Signal(str, object)
+
+    # --------------------------------------------------------------------------
+    def __init__(self, cache_limit=2000, thread_pool=None, parent=None):
+        super(ImageProcessor, self).__init__(parent)
+
+        self._cache_limit = cache_limit
+        self._thread_pool = thread_pool or Qt.QtCore.QThreadPool.globalInstance()
+
+        self._pixmaps = collections.OrderedDict()
+        self._pending = set()
+
+        self._imageReady.connect(self._onImageReady)
+
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def key(path, chain):
+        """
+        Returns the key which identifies the result of running the given
+        chain over the given image file. This is the key emitted by
+        pixmapReady.
+
+        :param path: Absolute path to the image
+        :type path: str
+
+        :param chain: The filters to apply
+        :type chain: FilterChain
+
+        :return: str
+        """
+        return '%s|%s' % (path, chain.key())
+
+    # --------------------------------------------------------------------------
+    def request(self, path, chain):
+        """
+        Requests the result of running the given chain over the given image
+        file. If it has already been generated the pixmap is returned,
+        otherwise None is returned and pixmapReady will be emitted once it
+        has been generated.
+
+        :param path: Absolute path to the image
+        :type path: str
+
+        :param chain: The filters to apply
+        :type chain: FilterChain
+
+        :return: QPixmap or None
+        """
+        key = self.key(path, chain)
+
+        if key in self._pixmaps:
+            pixmap = self._pixmaps.pop(key)
+            self._pixmaps[key] = pixmap
+            return pixmap
+
+        if key not in self._pending:
+            self._pending.add(key)
+            self._thread_pool.start(
+                _ImageFilterRunnable(
+                    key,
+                    path,
+                    chain,
+                    self._imageReady,
+                ),
+            )
+
+        return None
+
+    # --------------------------------------------------------------------------
+    def requestMany(self, paths, chain):
+        """
+        Requests the result of running the given chain over each of the
+        given image files.
+
+        :param paths: List of absolute paths to images
+        :type paths: list(str, str)
+
+        :param chain: The filters to apply
+        :type chain: FilterChain
+
+        :return: dict where the key is the path and the value is the pixmap
+            if it has already been generated, or None
+        """
+        return dict(
+            (path, self.request(path, chain))
+            for path in paths
+        )
+
+    # --------------------------------------------------------------------------
+    def clear(self):
+        """
+        Forgets all the generated pixmaps
+
+        :return: None
+        """
+        self._pixmaps.clear()
+
+    # --------------------------------------------------------------------------
+    def _onImageReady(self, key, image):
+        """
+        Triggered within the main thread when an image has been processed,
+        as QPixmaps can only be created within the main thread.
+        """
+        self._pending.discard(key)
+
+        # -- If the image could not be read or processed we emit a null
+        # -- pixmap but do not remember it, so it can be requested again
+        if image is None or image.isNull():
+            self.pixmapReady.emit(key, QPixmap())
+            return
+
+        pixmap = QPixmap.fromImage(image)
+
+        self._pixmaps[key] = pixmap
+
+        while len(self._pixmaps) > max(self._cache_limit, 0):
+            self._pixmaps.popitem(last=False)
+
+        self.pixmapReady.emit(key, pixmap)
+
+
+# ------------------------------------------------------------------------------
+# noinspection PyUnresolvedReferences,PyPep8Naming
+class _ImageFilterRunnable(Qt.QtCore.QRunnable):
+    """
+    Loads an image and runs a filter chain over it within a thread pool
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, key, path, chain, signal):
+        super(_ImageFilterRunnable, self).__init__()
+
+        self._key = key
+        self._path = path
+        self._chain = chain
+        self._signal = signal
+
+    # --------------------------------------------------------------------------
+    def run(self):
+        from .. import constants
+
+        image = None
+
+        # -- We must always emit, otherwise the request would be considered
+        # -- pending forever
+        try:
+            image = QImage(self._path)
+
+            if image.isNull():
+                constants.log.warning('Could not read image : %s' % self._path)
+
+            else:
+                image = self._chain.apply(image)
+
+        except Exception:
+            constants.log.exception(
+                'Failed to process image : %s' % self._path,
+            )
+            image = None
+
+        self._signal.emit(self._key, image)
@@ -4,9 +4,55 @@ to widgets
 """
 import os
 import re
+import time
+import weakref
+import functools
+import collections
 
 from . import toList
 from .. import constants
+from ..vendor import Qt
+
+
+# -- This is the maximum number of compiled stylesheets which we will
+# -- hold onto before evicting the least recently used
+CACHE_LIMIT = 64
+
+# -- This holds all our compiled stylesheets, ordered from the least
+# -- recently used to the most recently used
+_COMPILED_CACHE = collections.OrderedDict()
+
+
+# -- This holds the tokenised templates for each set of resolved styles
+_TEMPLATE_CACHE = collections.OrderedDict()
+
+# -- This is the pattern used to identify variables within stylesheets
+_VARIABLE_PATTERN = re.compile(r'(_[A-Z0-9]+(?:_[A-Z0-9]+)*_)')
+_VARIABLE_NAME = re.compile(r'_[A-Z0-9]+(?:_[A-Z0-9]+)*_$')
+
+# -- This holds the StyleRegistry instance which is shared across the
+# -- process, it is created on first use
+_REGISTRY = None
+
+# -- This holds the CompoundedStylesheetCache used by
+# -- getCachedCompoundedStylesheet, it is created on first use
+_STYLESHEET_CACHE = None
+
+# -- These are the patterns used to break apart a stylesheet when
+# -- minimising it
+_LITERAL_PATTERN = re.compile(
+    r'/\*.*?\*/'
+    r'|"(?:[^"\\]|\\.)*"'
+    r"|'(?:[^'\\]|\\.)*'"
+    r"""|url\(\s*(?:"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'|[^)]*)\s*\)""",
+    re.DOTALL,
+)
+_PLACEHOLDER_PATTERN = re.compile(r'\x00(\d+)\x00')
+_RULE_PATTERN = re.compile(r'([^{}]*)\{([^{}]*)\}')
+
+# -- This holds the application level ThemeManager, it is created
+# -- on first use
+_THEME_MANAGER = None
 
 
 # ------------------------------------------------------------------------------
@@ -52,69 +98,663 @@ def apply(styles, apply_to, **kwargs):
         >>> sk.styles.applyStyle("flame", button)
 
     """
-    # -- As we allow single elements or a list of elements to be
-    # -- passed we need to conform that now
-    styles = toList(styles)
-    available_styles = None
+    # -- Compile the stylesheet (or pull it from the cache if we have
+    # -- already compiled this combination) and apply it
+    apply_to.setStyleSheet(compileStyles(styles, **kwargs))
 
-    # -- Start collating our style data
-    compounded_style = ''
 
-    for given_style in styles:
+# ------------------------------------------------------------------------------
+def compileStyles(styles, **kwargs):
+    """
+    Resolves and compounds all the given styles in order and carries out any
+    variable replacements - returning the resulting stylesheet data. This is
+    what is used by apply, and accepts the same styles and kwargs.
 
-        extracted_style = None
+    Compiled results are held in a process wide cache which is keyed on the
+    resolved styles, the modification times of any style files and the
+    replacement parameters. This means repeatedly compiling the same theme
+    only costs a lookup. The cache is bound to CACHE_LIMIT entries, with the
+    least recently used entries being evicted first.
 
-        # -- Firstly we check if we're given an absolute path which
-        # -- resolves
-        if os.path.exists(given_style):
-            with open(given_style, 'r') as f:
-                extracted_style = f.read()
+    :param styles: A single stylesheet or list of stylesheets. See apply for
+        the supported forms.
+    :type styles: str or list(str, str)
 
-        # -- If we did not extract a style we need to check the locations
-        # -- in our environment path
-        if not extracted_style:
+    :return: compiled stylesheet data
+    :rtype: str
+    """
+    # -- We need to combine the kwargs with the defaults
+    styling_parameters = constants.STYLE_DEFAULTS.copy()
+    styling_parameters.update(kwargs)
 
-            # -- Read out the available styles if it is our first iteration
-            # -- during this call
-            available_styles = available_styles or _getAvailableStyles()
+    # -- Build the key which uniquely represents this compilation
+    resolved_styles = _resolveStyles(toList(styles))
+    cache_key = (
+        tuple(resolved_styles),
+        tuple(sorted(styling_parameters.items())),
+    )
 
-            # -- If we have the given style we store it
-            if given_style in available_styles:
-                with open(available_styles[given_style], 'r') as f:
-                    extracted_style = f.read()
+    # -- If we have already compiled this we can hand it straight back
+    compounded_style = _cacheGet(_COMPILED_CACHE, cache_key)
 
-        # -- Finally we need to check if we think this might be a
-        # -- style in its own right
-        if not extracted_style and ';' in given_style:
-            extracted_style = given_style
+    if compounded_style is not None:
+        return compounded_style
 
-        # -- If we still do not have an extracted style then we need
-        # -- to report a warning
-        if not extracted_style:
-            constants.log.warning(
-                'Could not extract or locate the style : %s' % given_style
+    # -- The styles are tokenised separately from the replacements, so
+    # -- re-compiling the same styles with different variables does not
+    # -- need to re-read or re-tokenise the style data
+    template_key = tuple(resolved_styles)
+    template = _cacheGet(_TEMPLATE_CACHE, template_key)
+
+    if template is None:
+
+        # -- Start collating our style data
+        style_data = ''
+
+        for given_data, style_path, _ in resolved_styles:
+
+            # -- If this style is a file we need to read it
+            if style_path:
+                with open(style_path, 'r') as f:
+                    given_data = f.read()
+
+            # -- Add this extracted data to the compounded style
+            style_data += '\n' + given_data
+
+        template = StyleTemplate(style_data)
+        _cacheStore(_TEMPLATE_CACHE, template_key, template)
+
+    # -- Now that we have compounded all our style information we can
+    # -- carry out any replacements and store the result
+    compounded_style = template.render(styling_parameters)
+    _cacheStore(_COMPILED_CACHE, cache_key, compounded_style)
+
+    return compounded_style
+
+
+# ------------------------------------------------------------------------------
+def clearCache():
+    """
+    Clears all the compiled stylesheets held in the cache, forcing the next
+    apply or compileStyles call to re-read and re-compile its styles.
+
+    :return: None
+    """
+    _COMPILED_CACHE.clear()
+    _TEMPLATE_CACHE.clear()
+
+
+# ------------------------------------------------------------------------------
+def available():
+    """
+    Returns a dictionary of all the stylesheets which can be found in the
+    locations defined by the QUTE_STYLE_PATH environment variable, where the
+    key is the name (without a qss or css suffix) and the value is the
+    absolute path.
+
+    Where there is a name clash, the last location will always override the
+    first.
+
+    :return: dict
+    """
+    return registry().styles()
+
+
+# ------------------------------------------------------------------------------
+def registry():
+    """
+    Returns the StyleRegistry which is shared across the process, creating
+    it if it does not yet exist.
+
+    :return: StyleRegistry
+    """
+    global _REGISTRY
+
+    if not _REGISTRY:
+        _REGISTRY = StyleRegistry()
+
+    return _REGISTRY
+
+
+# ------------------------------------------------------------------------------
+def themeManager():
+    """
+    Returns the ThemeManager which operates at the QApplication level,
+    creating it if it does not yet exist.
+
+    :return: ThemeManager
+    """
+    global _THEME_MANAGER
+
+    if not _THEME_MANAGER:
+        _THEME_MANAGER = ThemeManager()
+
+    return _THEME_MANAGER
+
+
+# ------------------------------------------------------------------------------
+class StyleTemplate(object):
+    """
+    A StyleTemplate tokenises stylesheet data once, splitting it into literal
+    text and variables (any upper case, underscore wrapped name such as
+    _BACKGROUND_ or _LIST_OPEN_PNG_). Rendering then only has to look up each
+    variable, meaning the cost is bound to the length of the stylesheet rather
+    than the number of replacements available.
+
+    Replacement keys which are not variables in this form (for instance
+    regular expressions, or plain words such as BG_COLOR) are still supported
+    and are applied as regular expression substitutions before the variables
+    are resolved, so any variables they insert are resolved too. Every
+    replacement is expanded in the same way re.sub expands it, so escapes
+    such as \\n behave the same whichever kind of key they are given for.
+
+    A variable may also be written within a longer token (such as
+    _FOREGROUND_ within A_B_FOREGROUND_). Any token without a replacement
+    of its own is therefore searched for the variables we do have.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, data):
+        self._data = data
+
+        # -- Splitting with a capturing group means every odd element
+        # -- is a variable and every even element is literal text
+        self._chunks = _VARIABLE_PATTERN.split(data)
+
+    # --------------------------------------------------------------------------
+    def variables(self):
+        """
+        Returns all the variable names which are used within this template
+
+        :return: set(str, str)
+        """
+        return set(self._chunks[1::2])
+
+    # --------------------------------------------------------------------------
+    def render(self, parameters):
+        """
+        Resolves the template using the given replacement parameters
+
+        :param parameters: Dictionary where the key is the variable (or
+            regular expression) to replace and the value is what it should
+            be replaced with
+        :type parameters: dict
+
+        :return: resolved stylesheet data
+        :rtype: str
+        """
+        variables = dict()
+        expressions = list()
+
+        for key, replacement in parameters.items():
+            if _VARIABLE_NAME.match(key):
+
+                # -- Expand any escapes just as re.sub would have done
+                if '\\' in replacement:
+                    replacement = re.sub(key, replacement, key)
+
+                variables[key] = replacement
+
+            else:
+                expressions.append((key, replacement))
+
+        # -- Carry out any replacements which are not variables first, as
+        # -- they may insert variables of their own. Only then do we need
+        # -- to tokenise the data again
+        if expressions:
+            data = self._data
+
+            for regex, replacement in expressions:
+                data = re.sub(regex, replacement, data)
+
+            chunks = _VARIABLE_PATTERN.split(data)
+
+        else:
+            chunks = list(self._chunks)
+
+        # -- Resolve all our variables in a single pass
+        unresolved = list()
+
+        for index in range(1, len(chunks), 2):
+            if chunks[index] in variables:
+                chunks[index] = variables[chunks[index]]
+
+            else:
+                unresolved.append(index)
+
+        # -- Any token we do not have a replacement for may still hold
+        # -- variables within it, with the longest variables taking
+        # -- precedence. Tokens without any are left untouched
+        if unresolved and variables:
+            embedded = re.compile(
+                '|'.join(
+                    re.escape(variable)
+                    for variable in sorted(variables, key=len, reverse=True)
+                )
             )
-            continue
 
-        # -- Add this extracted data to the compounded style
-        compounded_style += '\n' + extracted_style
+            for index in unresolved:
+                chunks[index] = embedded.sub(
+                    lambda match: variables[match.group(0)],
+                    chunks[index],
+                )
 
-    # -- We need to combine the kwargs with the defaults
-    styling_parameters = constants.STYLE_DEFAULTS.copy()
-    styling_parameters.update(kwargs)
+        return ''.join(chunks)
+
+
+# ------------------------------------------------------------------------------
+# noinspection PyUnresolvedReferences
+class StyleRegistry(object):
+    """
+    The StyleRegistry holds an index of all the stylesheets which exist
+    within the QUTE_STYLE_PATH locations, so resolving a style by name does
+    not need to list any directories.
+
+    The index is built once and then kept up to date one location at a time.
+    When a QApplication is available a QFileSystemWatcher is used to tell us
+    when a location changes, otherwise we fall back to checking the
+    modification time of each location - but no more often than every
+    POLL_INTERVAL seconds.
+
+    :param locations: Optional list of locations to index. If this is not
+        given then constants.QUTE_STYLE_LOCATIONS is used.
+    :type locations: list(str, str)
+    """
+
+    # -- The minimum number of seconds between checking our locations for
+    # -- changes when we are not able to use a file system watcher
+    POLL_INTERVAL = 2.0
+
+    # --------------------------------------------------------------------------
+    def __init__(self, locations=None):
+        self._given_locations = locations
+
+        # -- This is the list of locations we have currently indexed, along
+        # -- with the styles within each location and the modification time
+        # -- of each location when it was indexed
+        self._locations = list()
+        self._location_styles = dict()
+        self._location_times = dict()
+
+        # -- This is the resolved index of style names to paths
+        self._styles = dict()
+
+        self._watcher = None
+        self._last_poll = 0
 
-    # -- Now that we have compounded all our style information we can cycle
-    # -- over it and carry out any replacements
-    for regex, replacement in styling_parameters.items():
-        regex = re.compile(regex)
-        compounded_style = regex.sub(replacement, compounded_style)
+        self.refresh()
 
-    # -- Apply the composed stylesheet
-    apply_to.setStyleSheet(compounded_style)
+    # --------------------------------------------------------------------------
+    def locations(self):
+        """
+        Returns the locations this registry is indexing, in order of
+        priority (last wins).
+
+        :return: list(str, str)
+        """
+        if self._given_locations is not None:
+            return list(self._given_locations)
+
+        return list(constants.QUTE_STYLE_LOCATIONS)
+
+    # --------------------------------------------------------------------------
+    def styles(self):
+        """
+        Returns a dictionary of all the indexed styles, where the key is the
+        style name and the value is the absolute path.
+
+        :return: dict
+        """
+        self._update()
+        return dict(self._styles)
+
+    # --------------------------------------------------------------------------
+    def path(self, name):
+        """
+        Returns the absolute path of the style with the given name, or None
+        if no style with that name is indexed.
+
+        :param name: Name of the style (without a qss or css suffix)
+        :type name: str
+
+        :return: str or None
+        """
+        self._update()
+        return self._styles.get(name)
+
+    # --------------------------------------------------------------------------
+    def refresh(self, location=None):
+        """
+        Re-indexes the given location, or every location if no location
+        is given.
+
+        :param location: Optional location to re-index
+        :type location: str
+
+        :return: None
+        """
+        if location is None or location not in self._locations:
+            self._locations = self.locations()
+            self._location_styles = dict()
+            self._location_times = dict()
+
+            for location_ in self._locations:
+                self._indexLocation(location_)
+
+        else:
+            self._indexLocation(location)
+
+        # -- Build up our resolved index, taking the locations in order
+        # -- so that the last location will override the first
+        styles = dict()
+
+        for location_ in self._locations:
+            styles.update(self._location_styles.get(location_, dict()))
+
+        self._styles = styles
+
+    # --------------------------------------------------------------------------
+    def _indexLocation(self, location):
+        """
+        Lists the given location, storing all the css and qss files within it
+        """
+        styles = dict()
+
+        try:
+            self._location_times[location] = os.path.getmtime(location)
+            filenames = os.listdir(location)
+
+        except OSError:
+            self._location_times[location] = None
+            filenames = list()
+
+        for style_name in filenames:
+
+            test_name = style_name.lower()
+
+            # -- Only check for qss or css files
+            if test_name.endswith('.css') or test_name.endswith('.qss'):
+                styles[style_name[:-4]] = os.path.join(location, style_name)
+
+        self._location_styles[location] = styles
+
+    # --------------------------------------------------------------------------
+    def _update(self):
+        """
+        Ensures our index is reflective of the current locations. If we have
+        a file system watcher then it will already have triggered any updates
+        so we only need to check whether the locations themselves changed.
+        """
+        # -- If the locations have been altered we need to re-index
+        # -- from scratch
+        if self._locations != self.locations():
+            self.refresh()
+
+            if self._watcher:
+                self._watch()
+
+        if self._watcher:
+            return
+
+        # -- Without a watcher we need to poll the locations, but we do not
+        # -- want to do this on every request
+        if time.time() - self._last_poll < self.POLL_INTERVAL:
+            return
+
+        self._last_poll = time.time()
+
+        for location in self._locations:
+            try:
+                modified_time = os.path.getmtime(location)
+
+            except OSError:
+                modified_time = None
+
+            if modified_time != self._location_times.get(location):
+                self.refresh(location)
+
+        # -- Now that we are up to date, start watching the locations
+        # -- if we are now able to
+        self._watch()
+
+    # --------------------------------------------------------------------------
+    def _watch(self):
+        """
+        Sets a file system watcher to watch all our locations, providing
+        there is an application for it to run within.
+
+        :return: True if the locations are being watched
+        """
+        # -- Signals from the watcher can only be received if there
+        # -- is an application
+        if not Qt.QtCore.QCoreApplication.instance():
+            return False
+
+        if not self._watcher:
+            self._watcher = Qt.QtCore.QFileSystemWatcher()
+            self._watcher.directoryChanged.connect(self._onLocationChanged)
+
+        watched = self._watcher.directories()
+
+        if watched:
+            self._watcher.removePaths(watched)
+
+        existing = [
+            location
+            for location in self._locations
+            if os.path.isdir(location)
+        ]
+
+        if existing:
+            self._watcher.addPaths(existing)
+
+        return True
+
+    # --------------------------------------------------------------------------
+    def _onLocationChanged(self, location):
+        """
+        Triggered by the file system watcher whenever a location changes
+        """
+        for location_ in self._locations:
+            if os.path.normpath(location_) == os.path.normpath(location):
+                self.refresh(location_)
 
 
 # ------------------------------------------------------------------------------
-def getCompoundedStylesheet(widget):
+# noinspection PyUnresolvedReferences
+class ThemeManager(object):
+    """
+    The ThemeManager installs a compiled theme once on a root - either the
+    QApplication or a shared root widget - rather than applying the same
+    stylesheet to many individual widgets. This means Qt only has to polish
+    the widgets once, and swapping the theme is a single stylesheet change.
+
+    Subtrees which need to differ can be given scoped overrides. Overrides
+    are compiled with the theme replacements, so any variables they use
+    follow the theme when it is swapped.
+
+    .. code-block:: python
+
+        >>> import qute
+        >>>
+        >>> manager = qute.utilities.styling.themeManager()
+        >>> manager.setTheme('space', _FOREGROUND_='255, 150, 0')
+        >>> manager.setOverride(panel, 'QLabel { color: rgb(_HIGHLIGHT_); }')
+
+    :param root: The QWidget to install the theme on. If this is not given
+        the theme is installed on the QApplication.
+    :type root: QWidget
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, root=None):
+        self._root = root
+
+        self._styles = list()
+        self._parameters = dict()
+        self._stylesheet = ''
+
+        # -- This holds the override information for each widget, keyed by
+        # -- the id of the widget. The value is a dictionary holding a weak
+        # -- reference to the widget (so we do not keep it alive), its
+        # -- styles, replacements and compiled stylesheet, along with the
+        # -- slot connected to its destroyed signal
+        self._overrides = dict()
+
+    # --------------------------------------------------------------------------
+    def root(self):
+        """
+        Returns the object the theme is installed on
+
+        :return: QWidget or QApplication
+        """
+        return self._root or Qt.QtWidgets.QApplication.instance()
+
+    # --------------------------------------------------------------------------
+    def theme(self):
+        """
+        Returns the styles which make up the current theme
+
+        :return: list(str, str)
+        """
+        return list(self._styles)
+
+    # --------------------------------------------------------------------------
+    def stylesheet(self):
+        """
+        Returns the compiled stylesheet of the current theme
+
+        :return: str
+        """
+        return self._stylesheet
+
+    # --------------------------------------------------------------------------
+    def setTheme(self, styles, **kwargs):
+        """
+        Compiles the given styles and installs them on the root. This accepts
+        the same styles and replacements as apply. If this theme is already
+        installed then nothing is re-applied.
+
+        :param styles: A single stylesheet or list of stylesheets
+        :type styles: str or list(str, str)
+
+        :return: None
+        """
+        self._styles = toList(styles)
+        self._parameters = kwargs
+
+        stylesheet = compileStyles(self._styles, **kwargs)
+
+        if stylesheet != self._stylesheet:
+            self._stylesheet = stylesheet
+            self.root().setStyleSheet(stylesheet)
+
+        # -- Only the overrides whose result has changed due to the
+        # -- new replacements need to be re-applied
+        for widget in self.overrides():
+            self._applyOverride(widget)
+
+    # --------------------------------------------------------------------------
+    def setOverride(self, widget, styles, **kwargs):
+        """
+        Applies the given styles to the given widget, scoping them to that
+        widget and its children. The theme replacements are available to the
+        override, and any kwargs given here take precedence over them.
+
+        :param widget: The root of the subtree to override
+        :type widget: QWidget
+
+        :param styles: A single stylesheet or list of stylesheets
+        :type styles: str or list(str, str)
+
+        :return: None
+        """
+        key = id(widget)
+        override = self._overrides.get(key)
+
+        # -- An id can be re-used once a widget is gone, so we only re-use
+        # -- the override if it is for this same widget
+        if not override or override['widget']() is not widget:
+            on_destroyed = functools.partial(
+                self._overrides.pop,
+                key,
+                None,
+            )
+            widget.destroyed.connect(on_destroyed)
+
+            override = dict(
+                widget=weakref.ref(widget),
+                on_destroyed=on_destroyed,
+            )
+            self._overrides[key] = override
+
+        override['styles'] = toList(styles)
+        override['kwargs'] = kwargs
+        override['applied'] = None
+
+        self._applyOverride(widget)
+
+    # --------------------------------------------------------------------------
+    def removeOverride(self, widget):
+        """
+        Removes any override from the given widget, meaning it will once
+        again only be styled by the theme.
+
+        :param widget: The widget to remove the override from
+        :type widget: QWidget
+
+        :return: None
+        """
+        override = self._overrides.get(id(widget))
+
+        if not override or override['widget']() is not widget:
+            return
+
+        self._overrides.pop(id(widget))
+        widget.destroyed.disconnect(override['on_destroyed'])
+        widget.setStyleSheet('')
+
+    # --------------------------------------------------------------------------
+    def overrides(self):
+        """
+        Returns all the widgets which currently have overrides
+
+        :return: list(QWidget, QWidget)
+        """
+        widgets = list()
+
+        for key, override in list(self._overrides.items()):
+            widget = override['widget']()
+
+            # -- If the widget has gone we no longer need its override
+            if widget is None:
+                self._overrides.pop(key, None)
+                continue
+
+            widgets.append(widget)
+
+        return widgets
+
+    # --------------------------------------------------------------------------
+    def _applyOverride(self, widget):
+        """
+        Compiles the override for the given widget, and applies it if the
+        result differs from what is currently applied.
+        """
+        override = self._overrides[id(widget)]
+
+        parameters = self._parameters.copy()
+        parameters.update(override['kwargs'])
+
+        stylesheet = compileStyles(override['styles'], **parameters)
+
+        if stylesheet != override['applied']:
+            widget.setStyleSheet(stylesheet)
+            override['applied'] = stylesheet
+
+
+# ------------------------------------------------------------------------------
+def getCompoundedStylesheet(widget, minimal=False):
     """
     This will return the entire stylesheet which is affecting this widget.
     The resulting stylesheet will be the widgets stylesheet, and the
@@ -124,9 +764,16 @@ def getCompoundedStylesheet(widget):
     widgets style is first - meaning you can apply the returned stylesheet
     to create the exact same result.
 
+    If you are calling this for many widgets within the same hierarchy then
+    getCachedCompoundedStylesheet will be considerably faster.
+
     :param widget: Widget to read the style from
     :type widget: QWidget
 
+    :param minimal: If True, any duplicate rules will be removed from the
+        result. See minimise for more information.
+    :type minimal: bool
+
     :return: stylesheet data
     :rtype: str
     """
@@ -147,38 +794,407 @@ def getCompoundedStylesheet(widget):
     # -- Finally, we join it all together into a single string
     all_data = '\n'.join(all_data)
 
+    if minimal:
+        return minimise(all_data)
+
     return all_data
 
 
 # ------------------------------------------------------------------------------
-def _getAvailableStyles():
+def getCachedCompoundedStylesheet(widget, minimal=False):
+    """
+    This returns the same result as getCompoundedStylesheet, but the
+    compounded stylesheet of every widget in the hierarchy is cached. This
+    means that reading the stylesheet for many widgets which share ancestors
+    only compounds each ancestor once.
+
+    Cached entries are invalidated whenever the style or the parent of a
+    widget changes.
+
+    :param widget: Widget to read the style from
+    :type widget: QWidget
+
+    :param minimal: If True, any duplicate rules will be removed from the
+        result. See minimise for more information.
+    :type minimal: bool
+
+    :return: stylesheet data
+    :rtype: str
+    """
+    global _STYLESHEET_CACHE
+
+    if not _STYLESHEET_CACHE:
+        _STYLESHEET_CACHE = CompoundedStylesheetCache()
+
+    return _STYLESHEET_CACHE.get(widget, minimal=minimal)
+
+
+# ------------------------------------------------------------------------------
+def minimise(stylesheet):
+    """
+    Returns a minimal version of the given stylesheet where any duplicated
+    rules are removed. Where a rule is duplicated the last occurrence is
+    kept, as that is the one which takes precedence. Comments are removed
+    and whitespace is normalised.
+
+    This is useful when re-applying compounded stylesheets, as it prevents
+    the same rules being given to the style engine many times over.
+
+    :param stylesheet: stylesheet data to minimise
+    :type stylesheet: str
+
+    :return: minimised stylesheet data
+    :rtype: str
+    """
+    # -- Strings and urls may hold characters which would otherwise break
+    # -- up the rules (such as a semi-colon), so they are swapped out for
+    # -- placeholders whilst the rules are split. Comments are removed at
+    # -- the same time, so that quotes within them are not mistaken for
+    # -- the start of a string
+    literals = list()
+    literal_indices = dict()
+
+    def protect(match):
+        literal = match.group(0)
+
+        if literal.startswith('/*'):
+            return ''
+
+        if literal not in literal_indices:
+            literal_indices[literal] = len(literals)
+            literals.append(literal)
+
+        return '\x00%s\x00' % literal_indices[literal]
+
+    stylesheet = _LITERAL_PATTERN.sub(protect, stylesheet)
+
+    entries = list()
+    rule_end = 0
+
+    for match in _RULE_PATTERN.finditer(stylesheet):
+        rule_end = match.end()
+
+        # -- Anything before the selector (separated by a semi-colon) is
+        # -- a declaration which is not within a rule
+        declarations = match.group(1).split(';')
+        selector = declarations.pop()
+
+        entries.extend(_normaliseDeclarations(';'.join(declarations)))
+        entries.append(
+            '%s { %s }' % (
+                ', '.join(
+                    ' '.join(part.split())
+                    for part in selector.split(',')
+                ),
+                ' '.join(_normaliseDeclarations(match.group(2))),
+            ),
+        )
+
+    entries.extend(_normaliseDeclarations(stylesheet[rule_end:]))
+
+    # -- Remove the duplicates, keeping the last of each
+    seen = set()
+    minimal_entries = list()
+
+    for entry in reversed(entries):
+        if entry not in seen:
+            seen.add(entry)
+            minimal_entries.append(entry)
+
+    minimal_entries.reverse()
+
+    return _PLACEHOLDER_PATTERN.sub(
+        lambda match: literals[int(match.group(1))],
+        '\n'.join(minimal_entries),
+    )
+
+
+# ------------------------------------------------------------------------------
+# noinspection PyUnresolvedReferences,PyPep8Naming
+class CompoundedStylesheetCache(Qt.QtCore.QObject):
+    """
+    This holds the compounded stylesheet of every widget it is asked about,
+    which is built from the cached compounded stylesheet of its parent.
+
+    Each entry is checked against the current stylesheet of its widget
+    when it is looked up, as Qt does not tell us when the stylesheet of a
+    widget which has not yet been polished changes. An event filter is
+    also installed on each cached widget, so that when a widget's style or
+    parent changes its entry - and that of any cached descendant - is
+    invalidated straight away.
+
+    Entries are stored against the id of their widget and only hold a weak
+    reference to it, so the cache never keeps a widget alive. Entries are
+    dropped when their widget is destroyed.
+    """
+
+    # -- These are the events which mean the compounded stylesheet of
+    # -- a widget may have changed
+    _INVALIDATING_EVENTS = (
+        Qt.QtCore.QEvent.StyleChange,
+        Qt.QtCore.QEvent.ParentChange,
+    )
+
+    # --------------------------------------------------------------------------
+    def __init__(self, parent=None):
+        super(CompoundedStylesheetCache, self).__init__(parent)
+
+        self._stylesheets = dict()
+        self._minimal_stylesheets = dict()
+
+        # -- For each widget this holds the ids of the cached widgets
+        # -- whose entries were built from its entry
+        self._dependents = dict()
+
+        # -- Track which widgets we have installed our event filter on,
+        # -- along with what we connected to their destroyed signal
+        self._watched = dict()
+
+    # --------------------------------------------------------------------------
+    def get(self, widget, minimal=False):
+        """
+        Returns the compounded stylesheet of the given widget
+
+        :param widget: Widget to read the style from
+        :type widget: QWidget
+
+        :param minimal: If True, any duplicate rules will be removed
+        :type minimal: bool
+
+        :return: str
+        """
+        stylesheet = self._compound(widget)
+
+        if not minimal:
+            return stylesheet
+
+        # -- The minimal stylesheet is only valid whilst it was built from
+        # -- the same compounded stylesheet
+        cached = self._minimal_stylesheets.get(id(widget))
+
+        if not cached or cached[0] is not stylesheet:
+            cached = (stylesheet, minimise(stylesheet))
+            self._minimal_stylesheets[id(widget)] = cached
+
+        return cached[1]
+
+    # --------------------------------------------------------------------------
+    def invalidate(self, widget=None):
+        """
+        Removes the cached entry of the given widget along with any entries
+        of its descendants. If no widget is given the entire cache is cleared.
+
+        :param widget: The widget to invalidate
+        :type widget: QWidget
+
+        :return: None
+        """
+        if widget is None:
+            self._stylesheets.clear()
+            self._minimal_stylesheets.clear()
+            self._dependents.clear()
+            return
+
+        self._invalidate(id(widget))
+
+    # --------------------------------------------------------------------------
+    def eventFilter(self, watched, event):
+        if event.type() in self._INVALIDATING_EVENTS:
+            self._invalidate(id(watched))
+
+        return False
+
+    # --------------------------------------------------------------------------
+    def _compound(self, widget):
+        """
+        Returns the compounded stylesheet of the widget, building it from
+        the compounded stylesheet of its parent if it is not cached
+        """
+        parent = widget.parentWidget()
+        inherited = self._compound(parent) if parent else None
+
+        key = id(widget)
+        watched = self._watched.get(key)
+
+        # -- An id can be re-used once a widget is gone, in which case
+        # -- nothing we hold against it is for this widget
+        if watched and watched['widget']() is not widget:
+            self._forget(key)
+            watched = None
+
+        # -- An entry is only valid if the stylesheet of the widget is
+        # -- unchanged and it was built from the current entry of its parent
+        cached = self._stylesheets.get(key)
+        own = widget.styleSheet()
+
+        if cached and cached[0] == own and cached[1] is inherited:
+            return cached[2]
+
+        # -- Ensure we know when this widget changes
+        if not watched:
+            on_destroyed = functools.partial(
+                self._forget,
+                key,
+            )
+            widget.installEventFilter(self)
+            widget.destroyed.connect(on_destroyed)
+
+            self._watched[key] = dict(
+                widget=weakref.ref(widget),
+                on_destroyed=on_destroyed,
+            )
+
+        if parent:
+            stylesheet = inherited + '\n' + own
+            self._dependents.setdefault(id(parent), set()).add(key)
+
+        else:
+            stylesheet = own
+
+        self._stylesheets[key] = (own, inherited, stylesheet)
+
+        return stylesheet
+
+    # --------------------------------------------------------------------------
+    def _invalidate(self, key):
+        """
+        Removes the cached entry stored against the given widget id, along
+        with the entries of its descendants
+        """
+        self._stylesheets.pop(key, None)
+        self._minimal_stylesheets.pop(key, None)
+
+        for dependent in self._dependents.pop(key, set()):
+            self._invalidate(dependent)
+
+    # --------------------------------------------------------------------------
+    def _forget(self, key, *args):
+        """
+        Triggered when a widget we are tracking is destroyed
+        """
+        self._invalidate(key)
+        self._watched.pop(key, None)
+
+        for dependents in self._dependents.values():
+            dependents.discard(key)
+
+
+# ------------------------------------------------------------------------------
+def _normaliseDeclarations(declarations):
+    """
+    Splits the given declarations (such as 'color: red; border: none;') into
+    a list of individual declarations with normalised whitespace
     """
-    This will look at all the stylesheet locations on the environment path
-    and return a dictionary of them, where the key is the name (without a qss
-    or css suffix) and the value is the absolute path.
+    return [
+        '%s;' % ' '.join(declaration.split())
+        for declaration in declarations.split(';')
+        if declaration.strip()
+    ]
 
-    Where there is a name clash, the last will always override the first.
 
-    The order of searching is done by the order of paths defined in the
-    QUTE_STYLE_PATH environment variable.
+# ------------------------------------------------------------------------------
+def _resolveStyles(styles):
+    """
+    Takes a list of styles (in any of the forms supported by apply) and
+    resolves each one to a tuple of (style data, style path, modification
+    time). Where the style is a file the data is None, and where the style
+    is actual stylesheet data the path and modification time are None.
+
+    Any styles which cannot be resolved are reported and skipped.
 
-    :return:
+    :param styles: list of styles to resolve
+    :type styles: list(str, str)
+
+    :return: list(tuple(str, str, float))
     """
-    styles = dict()
+    resolved = list()
 
-    for location in constants.QUTE_STYLE_LOCATIONS:
+    for given_style in styles:
 
-        # -- Skip it if it is not accessible
-        if not os.path.exists(location):
+        style_path = None
+
+        # -- Firstly we check if we're given an absolute path which
+        # -- resolves
+        if os.path.isfile(given_style):
+            style_path = given_style
+
+        # -- If we did not find a file we need to check the locations
+        # -- in our environment path
+        if not style_path:
+            style_path = registry().path(given_style)
+
+        if style_path:
+            try:
+                resolved.append((None, style_path, os.path.getmtime(style_path)))
+                continue
+
+            except OSError:
+                pass
+
+        # -- Finally we need to check if we think this might be a
+        # -- style in its own right
+        if ';' in given_style:
+            resolved.append((given_style, None, None))
             continue
 
-        # -- Cycle over the files in the location
-        for style_name in os.listdir(location):
+        # -- If we still do not have a style then we need
+        # -- to report a warning
+        constants.log.warning(
+            'Could not extract or locate the style : %s' % given_style
+        )
 
-            test_name = style_name.lower()
+    return resolved
 
-            # -- Only check for qss or css files
-            if test_name.endswith('.css') or test_name.endswith('.qss'):
-                styles[style_name[:-4]] = os.path.join(location, style_name)
 
-    return styles
+# ------------------------------------------------------------------------------
+def _cacheGet(cache, key):
+    """
+    Returns the value stored against the given key in the given cache, marking
+    it as the most recently used. If the key is not present None is returned.
+
+    :param cache: The cache to read from
+    :type cache: collections.OrderedDict
+
+    :param key: The key to look up
+
+    :return: The cached value or None
+    """
+    if key not in cache:
+        return None
+
+    value = cache.pop(key)
+    cache[key] = value
+
+    return value
+
+
+# ------------------------------------------------------------------------------
+def _cacheStore(cache, key, value):
+    """
+    Stores the given value in the given cache, evicting the least recently
+    used entries if the cache now holds more than CACHE_LIMIT entries.
+
+    :param cache: The cache to write to
+    :type cache: collections.OrderedDict
+
+    :param key: The key to store the value against
+
+    :param value: The value to store
+
+    :return: None
+    """
+    cache[key] = value
+
+    while len(cache) > max(CACHE_LIMIT, 0):
+        cache.popitem(last=False)
+
+
+# ------------------------------------------------------------------------------
+def _getAvailableStyles():
+    """
+    This is kept for backward compatibility, you should use available()
+    instead.
+
+    :return: dict
+    """
+    return available()
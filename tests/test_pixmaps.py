@@ -0,0 +1,117 @@
+import random
+import unittest
+
+from qute.vendor import Qt
+from qute.utilities import pixmaps
+
+
+# ------------------------------------------------------------------------------
+def setUpModule():
+    global q_app
+    q_app = Qt.QtWidgets.QApplication.instance() or Qt.QtWidgets.QApplication([])
+
+
+# ------------------------------------------------------------------------------
+def randomImage(image_format, width=23, height=17):
+    """
+    Returns an image of the given format filled with random, mostly
+    semi-transparent, pixels
+    """
+    random.seed(0)
+
+    image = Qt.QtGui.QImage(width, height, Qt.QtGui.QImage.Format_ARGB32)
+
+    for x in range(width):
+        for y in range(height):
+            image.setPixel(x, y, random.getrandbits(32))
+
+    return image.convertToFormat(image_format)
+
+
+# ------------------------------------------------------------------------------
+def perPixel(image):
+    """
+    Returns the grayscale image as every pixel being processed individually
+    would give it
+    """
+    gray_image = pixmaps._toGrayscaleImagePerPixel(image)
+    gray_image.setAlphaChannel(pixmaps._alphaChannel(image))
+
+    return gray_image
+
+
+# ------------------------------------------------------------------------------
+class TestGrayscale(unittest.TestCase):
+
+    # --------------------------------------------------------------------------
+    def bulkMethods(self):
+        methods = [pixmaps._toGrayscaleImageBytes]
+
+        if pixmaps.numpy is not None:
+            methods.append(pixmaps._toGrayscaleImageNumpy)
+
+        if pixmaps._grayscale8MatchesQGray():
+            methods.append(pixmaps._toGrayscaleImageGrayscale8)
+
+        return methods
+
+    # --------------------------------------------------------------------------
+    def test_semi_transparent_premultiplied_pixel(self):
+        image = Qt.QtGui.QImage(1, 1, Qt.QtGui.QImage.Format_ARGB32_Premultiplied)
+        image.setPixel(0, 0, 0x80643219)
+
+        self.assertEqual(
+            pixmaps._toGrayscaleImage(image).pixel(0, 0),
+            perPixel(image).pixel(0, 0),
+        )
+
+    # --------------------------------------------------------------------------
+    def test_bulk_methods_match_per_pixel(self):
+        for image_format in [
+            Qt.QtGui.QImage.Format_RGB32,
+            Qt.QtGui.QImage.Format_ARGB32,
+            Qt.QtGui.QImage.Format_ARGB32_Premultiplied,
+        ]:
+            image = randomImage(image_format)
+            expected = perPixel(image)
+
+            for method in self.bulkMethods():
+                gray_image = method(image)
+                self.assertEqual(gray_image.format(), image_format)
+
+                gray_image.setAlphaChannel(pixmaps._alphaChannel(image))
+                self.assertTrue(
+                    gray_image == expected,
+                    '%s differs for %s' % (method.__name__, image_format),
+                )
+
+    # --------------------------------------------------------------------------
+    def test_other_formats_match_per_pixel(self):
+        image = randomImage(Qt.QtGui.QImage.Format_RGB888)
+
+        self.assertTrue(pixmaps._toGrayscaleImage(image) == perPixel(image))
+
+    # --------------------------------------------------------------------------
+    def test_padded_lines(self):
+        # -- Two pixels per line, each line followed by one unused pixel
+        data = bytes(bytearray(range(24)))
+        image = Qt.QtGui.QImage(data, 2, 2, 12, Qt.QtGui.QImage.Format_RGB32)
+
+        self.assertEqual(
+            pixmaps._pixelBytes(image),
+            data[0:8] + data[12:20],
+        )
+
+    # --------------------------------------------------------------------------
+    def test_to_grayscale(self):
+        image = randomImage(Qt.QtGui.QImage.Format_ARGB32_Premultiplied)
+        pixmap = Qt.QtGui.QPixmap.fromImage(image)
+
+        gray_pixmap = pixmaps.toGrayscale(pixmap)
+
+        self.assertEqual(gray_pixmap.size(), pixmap.size())
+        self.assertFalse(gray_pixmap.isNull())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+import textwrap
+import unittest
+import subprocess
+
+
+# -- The vendored Qt.py reads its settings when it is imported, so each
+# -- case is run in a new interpreter
+VENDOR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'qute',
+    'vendor',
+)
+
+UI_FILE = textwrap.dedent(
+    """
+    <ui version="4.0">
+     <class>Form</class>
+     <widget class="QWidget" name="Form">
+      <widget class="QPushButton" name="button"/>
+     </widget>
+    </ui>
+    """
+)
+
+
+# ------------------------------------------------------------------------------
+class TestQt(unittest.TestCase):
+
+    # --------------------------------------------------------------------------
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.directory, 'cache.json')
+
+    # --------------------------------------------------------------------------
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    # --------------------------------------------------------------------------
+    def run_qt(self, code, **environment):
+        """
+        Runs the given code after importing Qt, returning what it printed
+        as json
+        """
+        env = os.environ.copy()
+        env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+        for name in ['QT_BINDING_CACHE', 'QT_LAZY_IMPORT', 'QT_PREFERRED_BINDING']:
+            env.pop(name, None)
+
+        env.update(environment)
+        env['PYTHONPATH'] = VENDOR
+
+        output = subprocess.check_output(
+            [sys.executable, '-c', 'import sys, json\nimport Qt\n' + code],
+            env=env,
+        )
+
+        return json.loads(output.decode().strip().splitlines()[-1])
+
+    # --------------------------------------------------------------------------
+    def read_cache(self):
+        with open(self.cache_path) as f:
+            return list(json.load(f).values())[0]
+
+    # --------------------------------------------------------------------------
+    def write_cache(self, **changes):
+        with open(self.cache_path) as f:
+            data = json.load(f)
+
+        for entry in data.values():
+            entry.update(changes)
+
+        with open(self.cache_path, 'w') as f:
+            json.dump(data, f)
+
+    # --------------------------------------------------------------------------
+    def test_lazy_import_only_imports_qtcore(self):
+        modules = self.run_qt(
+            'print(json.dumps(sorted(\n'
+            '    name.split(".")[-1] for name in sys.modules\n'
+            '    if name.startswith(Qt.__binding__ + ".Qt")\n'
+            ')))',
+            QT_LAZY_IMPORT='1',
+        )
+
+        self.assertEqual(modules, ['QtCore'])
+
+    # --------------------------------------------------------------------------
+    def test_lazy_import_loads_ui(self):
+        ui_path = os.path.join(self.directory, 'form.ui')
+
+        with open(ui_path, 'w') as f:
+            f.write(UI_FILE)
+
+        name = self.run_qt(
+            'app = Qt.QtWidgets.QApplication([])\n'
+            'form = Qt.QtCompat.loadUi(%r)\n'
+            'print(json.dumps(form.button.objectName()))' % ui_path,
+            QT_LAZY_IMPORT='1',
+        )
+
+        self.assertEqual(name, 'button')
+
+    # --------------------------------------------------------------------------
+    def test_cache_is_written(self):
+        binding = self.run_qt(
+            'print(json.dumps(Qt.__binding__))',
+            QT_BINDING_CACHE=self.cache_path,
+        )
+
+        entry = self.read_cache()
+
+        self.assertEqual(entry['binding'], binding)
+        self.assertIsNotNone(entry['fingerprint'])
+
+    # --------------------------------------------------------------------------
+    def test_stale_binding_is_not_used(self):
+        binding = self.run_qt(
+            'print(json.dumps(Qt.__binding__))',
+            QT_BINDING_CACHE=self.cache_path,
+        )
+
+        # -- Claim the last binding in the order was resolved, which the
+        # -- order would not pick whilst the current binding is found
+        self.write_cache(binding='PyQt4')
+
+        self.assertEqual(
+            self.run_qt(
+                'print(json.dumps(Qt.__binding__))',
+                QT_BINDING_CACHE=self.cache_path,
+            ),
+            binding,
+        )
+        self.assertEqual(self.read_cache()['binding'], binding)
+
+    # --------------------------------------------------------------------------
+    def test_unavailable_modules_are_retried_when_install_changes(self):
+        self.run_qt('print(1)', QT_BINDING_CACHE=self.cache_path)
+
+        # -- Whilst the install is unchanged, modules cached as
+        # -- unavailable are not attempted
+        self.write_cache(unavailable=['QtXml'])
+
+        self.assertFalse(
+            self.run_qt(
+                'print(json.dumps(hasattr(Qt, "_QtXml")))',
+                QT_BINDING_CACHE=self.cache_path,
+            ),
+        )
+
+        # -- Once the install has changed they are attempted again
+        self.write_cache(fingerprint=['elsewhere', 0])
+
+        self.assertTrue(
+            self.run_qt(
+                'print(json.dumps(hasattr(Qt, "_QtXml")))',
+                QT_BINDING_CACHE=self.cache_path,
+            ),
+        )
+        self.assertNotIn('QtXml', self.read_cache()['unavailable'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+import re
+import gc
+import weakref
+import unittest
+import collections
+
+from qute.vendor import Qt
+from qute.utilities import styling
+
+
+# ------------------------------------------------------------------------------
+def setUpModule():
+    global q_app
+    q_app = Qt.QtWidgets.QApplication.instance() or Qt.QtWidgets.QApplication([])
+
+
+# ------------------------------------------------------------------------------
+class TestCompileStyles(unittest.TestCase):
+
+    # --------------------------------------------------------------------------
+    def test_compiles_styles_in_order(self):
+        stylesheet = styling.compileStyles(
+            [
+                'QWidget { color: _FOREGROUND_; }',
+                'QPushButton { color: _HIGHLIGHT_; }',
+            ],
+            _FOREGROUND_='red',
+            _HIGHLIGHT_='blue',
+        )
+
+        self.assertEqual(
+            stylesheet,
+            '\nQWidget { color: red; }\nQPushButton { color: blue; }',
+        )
+
+    # --------------------------------------------------------------------------
+    def test_apply(self):
+        widget = Qt.QtWidgets.QWidget()
+        styling.apply('QWidget { color: _FOREGROUND_; }', widget, _FOREGROUND_='red')
+
+        self.assertEqual(
+            widget.styleSheet(),
+            styling.compileStyles('QWidget { color: _FOREGROUND_; }', _FOREGROUND_='red'),
+        )
+
+
+# ------------------------------------------------------------------------------
+class TestStyleTemplate(unittest.TestCase):
+
+    # --------------------------------------------------------------------------
+    def render(self, data, parameters):
+        """
+        Returns the data rendered by a template along with the data rendered
+        as stylesheets were before templates were introduced
+        """
+        substituted = data
+
+        for regex, replacement in parameters.items():
+            substituted = re.sub(regex, replacement, substituted)
+
+        return styling.StyleTemplate(data).render(parameters), substituted
+
+    # --------------------------------------------------------------------------
+    def test_variables(self):
+        rendered, expected = self.render(
+            'QWidget { color: _FOREGROUND_; background: _BACKGROUND_; }',
+            dict(_FOREGROUND_='red', _BACKGROUND_='blue'),
+        )
+
+        self.assertEqual(rendered, 'QWidget { color: red; background: blue; }')
+        self.assertEqual(rendered, expected)
+
+    # --------------------------------------------------------------------------
+    def test_variable_within_longer_token(self):
+        rendered, expected = self.render(
+            'QWidget { image: url(A_B_FOREGROUND_); }',
+            dict(_FOREGROUND_='red'),
+        )
+
+        self.assertEqual(rendered, 'QWidget { image: url(A_Bred); }')
+        self.assertEqual(rendered, expected)
+
+    # --------------------------------------------------------------------------
+    def test_expression_inserting_variable(self):
+        rendered, expected = self.render(
+            'QWidget { color: BG_COLOR; }',
+            collections.OrderedDict(
+                [
+                    ('BG_COLOR', '_X_'),
+                    ('_X_', 'blue'),
+                ]
+            ),
+        )
+
+        self.assertEqual(rendered, 'QWidget { color: blue; }')
+        self.assertEqual(rendered, expected)
+
+    # --------------------------------------------------------------------------
+    def test_escapes_are_expanded_for_every_key(self):
+        rendered, expected = self.render(
+            'QWidget { color: _FOREGROUND_; background: BG_COLOR; }',
+            dict(_FOREGROUND_=r'red\\', BG_COLOR=r'blue\\'),
+        )
+
+        self.assertEqual(rendered, 'QWidget { color: red\\; background: blue\\; }')
+        self.assertEqual(rendered, expected)
+
+
+# ------------------------------------------------------------------------------
+class TestCompoundedStylesheetCache(unittest.TestCase):
+
+    # --------------------------------------------------------------------------
+    def test_compounds_parent_stylesheets(self):
+        cache = styling.CompoundedStylesheetCache()
+
+        parent = Qt.QtWidgets.QWidget()
+        parent.setStyleSheet('QWidget { color: red; }')
+
+        child = Qt.QtWidgets.QWidget(parent)
+        child.setStyleSheet('QWidget { color: blue; }')
+
+        self.assertEqual(
+            cache.get(child),
+            'QWidget { color: red; }\nQWidget { color: blue; }',
+        )
+
+        # -- Changing the parent must be reflected in the child
+        parent.setStyleSheet('QWidget { color: green; }')
+
+        self.assertEqual(
+            cache.get(child),
+            'QWidget { color: green; }\nQWidget { color: blue; }',
+        )
+
+    # --------------------------------------------------------------------------
+    def test_does_not_keep_widgets_alive(self):
+        cache = styling.CompoundedStylesheetCache()
+
+        widget = Qt.QtWidgets.QWidget()
+        widget.setStyleSheet('QWidget { color: red; }')
+        Qt.QtWidgets.QWidget(widget)
+
+        cache.get(widget.findChild(Qt.QtWidgets.QWidget), minimal=True)
+
+        reference = weakref.ref(widget)
+        del widget
+        gc.collect()
+
+        self.assertIsNone(reference())
+
+    # --------------------------------------------------------------------------
+    def test_forgets_destroyed_widgets(self):
+        cache = styling.CompoundedStylesheetCache()
+
+        parent = Qt.QtWidgets.QWidget()
+        child = Qt.QtWidgets.QWidget(parent)
+        child.setStyleSheet('QWidget { color: red; }')
+
+        cache.get(child, minimal=True)
+
+        Qt.QtCompat.delete(child)
+
+        self.assertEqual(len(cache._stylesheets), 1)
+        self.assertEqual(len(cache._minimal_stylesheets), 0)
+        self.assertEqual(len(cache._watched), 1)
+        self.assertEqual(cache._dependents, {id(parent): set()})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+
+from qute.vendor import Qt
+from qute.extensions import tray
+
+
+# ------------------------------------------------------------------------------
+def setUpModule():
+    global q_app
+    q_app = Qt.QtWidgets.QApplication.instance() or Qt.QtWidgets.QApplication([])
+
+
+# ------------------------------------------------------------------------------
+def failingTask():
+    raise ValueError('Something went wrong')
+
+
+# ------------------------------------------------------------------------------
+class QuietTray(object):
+    verbose = False
+
+
+# ------------------------------------------------------------------------------
+class TestProcessorThread(unittest.TestCase):
+
+    # --------------------------------------------------------------------------
+    def test_failures_are_logged(self):
+        thread = tray.ProcessorThread([failingTask], QuietTray())
+
+        with self.assertLogs('qute', level='ERROR') as logs:
+            thread.run()
+
+        self.assertEqual(thread.failures, set([0]))
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn('failingTask', logs.output[0])
+        self.assertIn('Traceback', logs.output[0])
+        self.assertIn('ValueError: Something went wrong', logs.output[0])
+
+
+if __name__ == '__main__':
+    unittest.main()